@@ -1,7 +1,7 @@
 """Core interfaces and abstractions for the evaluation framework."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -40,7 +40,7 @@ class EvaluationMetric:
             "comment": self.comment
         }
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """Container for log entry data."""
     content: str
@@ -101,6 +101,14 @@ class Evaluator(ABC):
         """Evaluate the outputs against the reference."""
         pass
     
+    async def evaluate_batch(self, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[EvaluationMetric]:
+        """Evaluate many (outputs, reference) pairs in order.
+        
+        The pairs are awaited one after another; the evaluators score in pure
+        Python without awaiting, so fanning them out would only add task overhead.
+        """
+        return [await self.evaluate(outputs, reference) for outputs, reference in pairs]
+    
     @abstractmethod
     def get_name(self) -> str:
         """Get the name of the evaluator."""
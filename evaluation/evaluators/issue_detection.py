@@ -1,10 +1,53 @@
 """Issue detection evaluator for log analysis accuracy."""
 
+import hashlib
 import re
-from typing import Dict, Any, List, Set, Optional
+from collections import OrderedDict, defaultdict
+from itertools import chain
+from typing import Dict, Any, List, Set, Optional, Tuple
 from ..core.interfaces import Evaluator, EvaluationMetric, EvaluationResult, SystemType
 
 
+# Compiled once at import; used for keyword extraction from non-ASCII text
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Every ASCII character outside \w becomes a space, so split() yields the same runs
+_ASCII_NON_WORD = str.maketrans({
+    chr(code): " " for code in range(128) if not (chr(code).isalnum() or chr(code) == "_")
+})
+
+_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "is", "was", "are", "were"
+})
+
+# Keyword similarity an issue pair must exceed to count as a match
+_MATCH_THRESHOLD = 0.3
+
+# Log scans kept per evaluator; keyed on a digest so no log text is held on to
+_LOG_SCAN_CACHE_SIZE = 8
+
+# Hashable form of issue_keywords: ((issue_type, (keyword, ...)), ...)
+_FrozenKeywords = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+def _scan_log_keywords(log_lower: str, frozen_keywords: _FrozenKeywords) -> _FrozenKeywords:
+    """Find the indicator keywords of each issue type present in a lowercased log."""
+    # One substring search per distinct keyword; each is a single fast scan of
+    # the log, where a regex alternation is tried at every character
+    all_keywords = {keyword for _, keywords in frozen_keywords for keyword in keywords}
+    found_keywords = {keyword for keyword in all_keywords if keyword in log_lower}
+    
+    potential_issues = []
+    for issue_type, keywords in frozen_keywords:
+        found_indicators = tuple(keyword for keyword in keywords if keyword in found_keywords)
+        
+        if found_indicators:
+            potential_issues.append((issue_type, found_indicators))
+    
+    return tuple(potential_issues)
+
+
 class IssueDetectionEvaluator(Evaluator):
     """Evaluates accuracy of issue detection in log analysis."""
     
@@ -33,6 +76,31 @@ class IssueDetectionEvaluator(Evaluator):
             "low": 0.4,
             "info": 0.2
         }
+        
+        # Severity -> group id; severities sharing a group count as similar
+        severity_groups = [
+            {"critical", "high", "fatal", "error"},
+            {"medium", "warning", "warn"},
+            {"low", "info", "notice"}
+        ]
+        self._severity_group = {
+            severity: group_id
+            for group_id, group in enumerate(severity_groups)
+            for severity in group
+        }
+        
+        # Immutable keyword config for the module-level log scan
+        self._frozen_keywords: _FrozenKeywords = tuple(
+            (issue_type, tuple(keywords)) for issue_type, keywords in self.issue_keywords.items()
+        )
+        
+        # Log digest -> scan result, least recently used first
+        self._log_scan_cache: "OrderedDict[str, _FrozenKeywords]" = OrderedDict()
+        
+        # Every distinct indicator keyword, for the no-detections early-out
+        self._all_keywords = tuple(dict.fromkeys(
+            keyword for keywords in self.issue_keywords.values() for keyword in keywords
+        ))
     
     def get_name(self) -> str:
         """Get the name of the evaluator."""
@@ -68,21 +136,29 @@ class IssueDetectionEvaluator(Evaluator):
         
         # Calculate scores
         if reference_issues:
+            # Extract keywords once per issue and score every pair once; precision,
+            # recall and severity matching all read from the same matrix
+            similarity = self._similarity_matrix(
+                self._extract_all_keywords(detected_issues),
+                self._extract_all_keywords(reference_issues)
+            )
+            
             # Use reference issues for comparison
-            precision = self._calculate_precision(detected_issues, reference_issues)
-            recall = self._calculate_recall(detected_issues, reference_issues)
+            precision = self._calculate_precision(similarity)
+            recall = self._calculate_recall(similarity, len(reference_issues))
             f1_score = self._calculate_f1_score(precision, recall)
             
             # Evaluate severity accuracy
-            severity_accuracy = self._evaluate_severity_accuracy(detected_issues, reference_issues)
+            severity_accuracy = self._evaluate_severity_accuracy(detected_issues, reference_issues, similarity)
             
             # Combined score
             overall_score = 0.6 * f1_score + 0.4 * severity_accuracy
             
             comment = self._create_reference_comment(precision, recall, f1_score, severity_accuracy)
         else:
-            # Use heuristic evaluation based on log content
-            detection_score = self._heuristic_detection_evaluation(detected_issues, log_content)
+            # Use heuristic evaluation based on log content, lowercased once up front
+            log_lower = log_content.lower()
+            detection_score = self._heuristic_detection_evaluation(detected_issues, log_lower)
             classification_score = self._evaluate_issue_classification(detected_issues)
             
             overall_score = 0.7 * detection_score + 0.3 * classification_score
@@ -105,31 +181,31 @@ class IssueDetectionEvaluator(Evaluator):
             result=result
         )
     
-    def _calculate_precision(self, detected: List[Dict], reference: List[Dict]) -> float:
-        """Calculate precision of issue detection."""
-        if not detected:
+    def _calculate_precision(self, similarity: List[List[float]]) -> float:
+        """Calculate precision of issue detection from the detected x reference similarity matrix."""
+        if not similarity:
             return 0.0
         
         true_positives = 0
         
-        for detected_issue in detected:
-            if self._find_matching_issue(detected_issue, reference):
+        for row in similarity:
+            if max(row, default=0.0) > _MATCH_THRESHOLD:
                 true_positives += 1
         
-        return true_positives / len(detected)
+        return true_positives / len(similarity)
     
-    def _calculate_recall(self, detected: List[Dict], reference: List[Dict]) -> float:
-        """Calculate recall of issue detection."""
-        if not reference:
+    def _calculate_recall(self, similarity: List[List[float]], reference_count: int) -> float:
+        """Calculate recall of issue detection from the detected x reference similarity matrix."""
+        if not reference_count:
             return 1.0
         
         true_positives = 0
         
-        for reference_issue in reference:
-            if self._find_matching_issue(reference_issue, detected):
+        for column in zip(*similarity):
+            if max(column) > _MATCH_THRESHOLD:
                 true_positives += 1
         
-        return true_positives / len(reference)
+        return true_positives / reference_count
     
     def _calculate_f1_score(self, precision: float, recall: float) -> float:
         """Calculate F1 score from precision and recall."""
@@ -138,25 +214,36 @@ class IssueDetectionEvaluator(Evaluator):
         
         return 2 * precision * recall / (precision + recall)
     
-    def _find_matching_issue(self, issue: Dict, issue_list: List[Dict]) -> bool:
-        """Find if an issue matches any issue in the list."""
-        issue_text = self._extract_issue_text(issue).lower()
-        issue_keywords = self._extract_keywords(issue_text)
-        
-        for candidate in issue_list:
-            candidate_text = self._extract_issue_text(candidate).lower()
-            candidate_keywords = self._extract_keywords(candidate_text)
-            
-            # Check for keyword overlap
-            overlap = len(issue_keywords & candidate_keywords)
-            total_keywords = len(issue_keywords | candidate_keywords)
-            
-            if total_keywords > 0:
-                similarity = overlap / total_keywords
-                if similarity > 0.3:  # Threshold for matching
-                    return True
+    def _similarity_matrix(self, detected_keywords: List[Set[str]],
+                           reference_keywords: List[Set[str]]) -> List[List[float]]:
+        """Score every (detected, reference) pair once, one row per detected issue.
+        
+        Only pairs sharing at least one keyword are scored; an inverted index over the
+        reference keywords yields those candidates and every other pair stays 0.0.
+        """
+        detected_masks, reference_masks = self._encode_keyword_sets(detected_keywords, reference_keywords)
+        
+        reference_index: Dict[str, List[int]] = defaultdict(list)
+        for index, keywords in enumerate(reference_keywords):
+            for word in keywords:
+                reference_index[word].append(index)
         
-        return False
+        reference_sizes = [len(keywords) for keywords in reference_keywords]
+        
+        similarity = []
+        for keywords, detected_mask in zip(detected_keywords, detected_masks):
+            row = [0.0] * len(reference_masks)
+            detected_size = len(keywords)
+            candidates = set(chain.from_iterable(reference_index.get(word, ()) for word in keywords))
+            
+            # Jaccard over bitmasks with the union size by inclusion-exclusion;
+            # candidates share a keyword, so the union is never empty
+            for index in candidates:
+                overlap = (detected_mask & reference_masks[index]).bit_count()
+                row[index] = overlap / (detected_size + reference_sizes[index] - overlap)
+            similarity.append(row)
+        
+        return similarity
     
     def _extract_issue_text(self, issue: Dict) -> str:
         """Extract text from an issue for comparison."""
@@ -174,16 +261,43 @@ class IssueDetectionEvaluator(Evaluator):
     
     def _extract_keywords(self, text: str) -> Set[str]:
         """Extract keywords from text."""
-        # Remove punctuation and split
-        words = re.findall(r'\b\w+\b', text.lower())
+        text = text.lower()
+        
+        # Remove punctuation and split; plain str methods beat the regex engine on ASCII
+        if text.isascii():
+            words = text.translate(_ASCII_NON_WORD).split()
+        else:
+            words = _WORD_RE.findall(text)
         
         # Remove common words
-        stopwords = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "is", "was", "are", "were"}
-        keywords = set(words) - stopwords
+        return set(words).difference(_STOPWORDS)
+    
+    def _extract_all_keywords(self, issues: List[Dict]) -> List[Set[str]]:
+        """Extract the keyword set of every issue, preserving order."""
+        return [self._extract_keywords(self._extract_issue_text(issue)) for issue in issues]
+    
+    def _encode_keyword_sets(self, *keyword_lists: List[Set[str]]) -> List[List[int]]:
+        """Encode keyword sets as int bitmasks over their combined vocabulary.
         
-        return keywords
+        Bit i of a mask is set when the set contains the i-th distinct keyword, so
+        overlap and union sizes reduce to bit counts of two ints and-ed or or-ed.
+        """
+        vocabulary: Dict[str, int] = {}
+        encoded = []
+        
+        for keyword_sets in keyword_lists:
+            masks = []
+            for keywords in keyword_sets:
+                mask = 0
+                for word in keywords:
+                    mask |= 1 << vocabulary.setdefault(word, len(vocabulary))
+                masks.append(mask)
+            encoded.append(masks)
+        
+        return encoded
     
-    def _evaluate_severity_accuracy(self, detected: List[Dict], reference: List[Dict]) -> float:
+    def _evaluate_severity_accuracy(self, detected: List[Dict], reference: List[Dict],
+                                    similarity: List[List[float]]) -> float:
         """Evaluate accuracy of severity classification."""
         if not detected or not reference:
             return 0.0
@@ -191,9 +305,11 @@ class IssueDetectionEvaluator(Evaluator):
         correct_severities = 0
         total_matched = 0
         
-        for detected_issue in detected:
-            matching_ref = self._find_matching_reference_issue(detected_issue, reference)
-            if matching_ref:
+        for detected_issue, row in zip(detected, similarity):
+            # Best matching reference issue is the first with the highest similarity
+            best_similarity = max(row)
+            if best_similarity > _MATCH_THRESHOLD:
+                matching_ref = reference[row.index(best_similarity)]
                 total_matched += 1
                 detected_severity = detected_issue.get("severity", "").lower()
                 reference_severity = matching_ref.get("severity", "").lower()
@@ -205,54 +321,36 @@ class IssueDetectionEvaluator(Evaluator):
         
         return correct_severities / total_matched if total_matched > 0 else 0.0
     
-    def _find_matching_reference_issue(self, issue: Dict, reference: List[Dict]) -> Optional[Dict]:
-        """Find the best matching reference issue."""
-        issue_text = self._extract_issue_text(issue).lower()
-        issue_keywords = self._extract_keywords(issue_text)
-        
-        best_match = None
-        best_similarity = 0
-        
-        for candidate in reference:
-            candidate_text = self._extract_issue_text(candidate).lower()
-            candidate_keywords = self._extract_keywords(candidate_text)
-            
-            overlap = len(issue_keywords & candidate_keywords)
-            total_keywords = len(issue_keywords | candidate_keywords)
-            
-            if total_keywords > 0:
-                similarity = overlap / total_keywords
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_match = candidate
-        
-        return best_match if best_similarity > 0.3 else None
-    
     def _similar_severity(self, severity1: str, severity2: str) -> bool:
         """Check if two severities are similar."""
-        severity_groups = [
-            {"critical", "high", "fatal", "error"},
-            {"medium", "warning", "warn"},
-            {"low", "info", "notice"}
-        ]
-        
-        for group in severity_groups:
-            if severity1 in group and severity2 in group:
-                return True
-        
-        return False
+        # Distinct defaults so two unknown severities never compare equal
+        return self._severity_group.get(severity1, -1) == self._severity_group.get(severity2, -2)
     
-    def _heuristic_detection_evaluation(self, detected_issues: List[Dict], log_content: str) -> float:
-        """Evaluate issue detection using heuristics when no reference is available."""
-        if not log_content:
+    def _heuristic_detection_evaluation(self, detected_issues: List[Dict], log_lower: str) -> float:
+        """Evaluate issue detection using heuristics when no reference is available.
+        
+        Args:
+            detected_issues: Issues reported by the system
+            log_lower: Log content, already lowercased
+        """
+        if not log_lower:
             return 0.5  # Default score
         
+        if not detected_issues:
+            # Only whether the log has any indicator matters, so stop at the first one
+            has_indicators = any(keyword in log_lower for keyword in self._all_keywords)
+            return 0.0 if has_indicators else 0.8
+        
         # Analyze log content for potential issues
-        potential_issues = self._analyze_log_content(log_content)
+        potential_issues = self._analyze_log_content(log_lower)
         
         if not potential_issues:
-            # No issues in log - penalize false positives
-            return 0.8 if not detected_issues else 0.4
+            return 0.4  # No issues in log - penalize false positives
+        
+        # The issue type is irrelevant to whether an issue matches, so flatten every
+        # indicator into one alternation and search each issue's text once
+        indicators = {indicator for found in potential_issues.values() for indicator in found}
+        indicator_regex = re.compile("|".join(re.escape(indicator) for indicator in indicators))
         
         # Check if detected issues align with potential issues
         detection_score = 0.0
@@ -261,13 +359,7 @@ class IssueDetectionEvaluator(Evaluator):
             issue_text = self._extract_issue_text(detected_issue).lower()
             
             # Check if detected issue matches potential issues
-            matches_potential = False
-            for potential_type, indicators in potential_issues.items():
-                if any(indicator in issue_text for indicator in indicators):
-                    matches_potential = True
-                    break
-            
-            if matches_potential:
+            if indicator_regex.search(issue_text):
                 detection_score += 1.0
             else:
                 detection_score += 0.2  # Penalty for false positive
@@ -278,21 +370,23 @@ class IssueDetectionEvaluator(Evaluator):
         
         return min(1.0, detection_score)
     
-    def _analyze_log_content(self, log_content: str) -> Dict[str, List[str]]:
-        """Analyze log content to identify potential issues."""
-        log_lower = log_content.lower()
-        potential_issues = {}
-        
-        for issue_type, keywords in self.issue_keywords.items():
-            found_indicators = []
-            for keyword in keywords:
-                if keyword in log_lower:
-                    found_indicators.append(keyword)
-            
-            if found_indicators:
-                potential_issues[issue_type] = found_indicators
+    def _analyze_log_content(self, log_lower: str) -> Dict[str, List[str]]:
+        """Analyze lowercased log content to identify potential issues.
+        
+        Recent scans are cached, so evaluating the same log again skips the scan.
+        """
+        log_digest = hashlib.sha256(log_lower.encode("utf-8", "surrogatepass")).hexdigest()
+        
+        potential_issues = self._log_scan_cache.get(log_digest)
+        if potential_issues is None:
+            potential_issues = _scan_log_keywords(log_lower, self._frozen_keywords)
+            self._log_scan_cache[log_digest] = potential_issues
+            if len(self._log_scan_cache) > _LOG_SCAN_CACHE_SIZE:
+                self._log_scan_cache.popitem(last=False)
+        else:
+            self._log_scan_cache.move_to_end(log_digest)
         
-        return potential_issues
+        return {issue_type: list(indicators) for issue_type, indicators in potential_issues}
     
     def _evaluate_issue_classification(self, detected_issues: List[Dict]) -> float:
         """Evaluate the classification quality of detected issues."""
@@ -301,28 +395,22 @@ class IssueDetectionEvaluator(Evaluator):
         
         classification_score = 0.0
         
+        severity_weights = self.severity_weights
+        
         for issue in detected_issues:
-            score = 0.0
-            
             # Check for proper structure
-            if isinstance(issue, dict):
-                score += 0.2
-                
-                # Check for required fields
-                if "type" in issue or "category" in issue:
-                    score += 0.3
-                
-                if "severity" in issue:
-                    severity = issue["severity"].lower()
-                    if severity in self.severity_weights:
-                        score += 0.2
-                
-                if "description" in issue:
-                    description = issue["description"]
-                    if len(description) > 10:  # Meaningful description
-                        score += 0.3
+            if not isinstance(issue, dict):
+                continue
+            
+            get = issue.get
             
-            classification_score += score
+            # Structure, type/category, known severity and a meaningful description
+            classification_score += (
+                0.2
+                + 0.3 * ("type" in issue or "category" in issue)
+                + 0.2 * (get("severity", "").lower() in severity_weights)
+                + 0.3 * (len(get("description", "")) > 10)
+            )
         
         return classification_score / len(detected_issues)
     
@@ -1,10 +1,31 @@
 """Response time evaluator for log analysis performance."""
 
 import time
-from typing import Dict, Any, Optional
+from bisect import bisect_left
+from typing import Dict, Any, Optional, Sequence, Tuple
 from ..core.interfaces import Evaluator, EvaluationMetric, EvaluationResult, SystemType
 
 
+# Reference system_type (a value string, or already a member) -> SystemType
+_SYSTEM_TYPE_BY_VALUE: Dict[Any, SystemType] = {
+    **{system_type.value: system_type for system_type in SystemType},
+    **{system_type: system_type for system_type in SystemType}
+}
+
+
+def _interpolate(xs: Sequence[float], ys: Sequence[float], x: float) -> float:
+    """Piecewise-linear interpolation over sorted breakpoints, clamped at both ends."""
+    index = bisect_left(xs, x)
+    if index == 0:
+        return ys[0]
+    if index == len(xs):
+        return ys[-1]
+    
+    x0, x1 = xs[index - 1], xs[index]
+    y0, y1 = ys[index - 1], ys[index]
+    return y0 + (x - x0) * (y1 - y0) / (x1 - x0)
+
+
 class ResponseTimeEvaluator(Evaluator):
     """Evaluates response time performance of log analysis."""
     
@@ -27,6 +48,19 @@ class ResponseTimeEvaluator(Evaluator):
             SystemType.STANDALONE: 10.0
         }
         self.timeout_threshold = timeout_threshold
+        
+        # Score breakpoints per target time, including the default target
+        self._score_tables = {
+            target_time: self._build_score_table(target_time)
+            for target_time in {*self.target_times.values(), 10.0}
+        }
+        
+        # The same breakpoints in integer nanoseconds, for outputs that report response_time_ns
+        self._score_tables_ns = {
+            target_time: self._to_ns_table(table)
+            for target_time, table in self._score_tables.items()
+        }
+        self._timeout_threshold_ns = int(timeout_threshold * 1e9)
     
     def get_name(self) -> str:
         """Get the name of the evaluator."""
@@ -50,28 +84,41 @@ class ResponseTimeEvaluator(Evaluator):
         Returns:
             EvaluationMetric with response time score
         """
-        # Extract response time
-        response_time = outputs.get("response_time", 0.0)
+        # Extract response time, preferring integer nanoseconds when reported
+        response_time_ns = outputs.get("response_time_ns")
+        if isinstance(response_time_ns, int) and response_time_ns > 0:
+            response_time = response_time_ns / 1e9
+        else:
+            response_time_ns = None
+            response_time = outputs.get("response_time", 0.0)
         
         # If response time is not provided, try to extract from timestamps
-        if response_time == 0.0:
+        if response_time == 0.0 and response_time_ns is None:
             start_time = outputs.get("start_time", 0.0)
             end_time = outputs.get("end_time", 0.0)
             if start_time and end_time:
                 response_time = end_time - start_time
         
-        # Extract system type
-        system_type_str = reference.get("system_type", "application")
-        try:
-            system_type = SystemType(system_type_str)
-        except ValueError:
-            system_type = SystemType.APPLICATION
+        # No measurement scores zero without going through the score curve
+        if response_time <= 0:
+            return EvaluationMetric(
+                key="response_time",
+                value=response_time,
+                score=0.0,
+                comment=self._create_response_time_comment(
+                    response_time, self._get_target_time(reference), 0.0
+                ),
+                result=EvaluationResult.FAILED
+            )
         
         # Get target time for this system type
-        target_time = self.target_times.get(system_type, 10.0)
+        target_time = self._get_target_time(reference)
         
         # Calculate score based on response time
-        score = self._calculate_response_time_score(response_time, target_time)
+        if response_time_ns is not None:
+            score = self._calculate_response_time_score_ns(response_time_ns, target_time)
+        else:
+            score = self._calculate_response_time_score(response_time, target_time)
         
         # Determine result
         if response_time > self.timeout_threshold:
@@ -94,6 +141,12 @@ class ResponseTimeEvaluator(Evaluator):
             result=result
         )
     
+    def _get_target_time(self, reference: Dict[str, Any]) -> float:
+        """Get the target response time for the reference's system type."""
+        system_type_str = reference.get("system_type", "application")
+        system_type = _SYSTEM_TYPE_BY_VALUE.get(system_type_str, SystemType.APPLICATION)
+        return self.target_times.get(system_type, 10.0)
+    
     def _calculate_response_time_score(self, actual_time: float, target_time: float) -> float:
         """Calculate response time score based on actual vs target time.
         
@@ -104,26 +157,44 @@ class ResponseTimeEvaluator(Evaluator):
         Returns:
             Score between 0 and 1
         """
-        if actual_time <= 0:
+        # No score without a measurement, or for very slow responses
+        if actual_time <= 0 or actual_time > self.timeout_threshold:
             return 0.0
         
-        # Perfect score if under target time
-        if actual_time <= target_time:
-            return 1.0
+        xs, ys = self._score_tables.get(target_time) or self._build_score_table(target_time)
+        return _interpolate(xs, ys, actual_time)
+    
+    def _calculate_response_time_score_ns(self, actual_ns: int, target_time: float) -> float:
+        """Calculate the response time score from integer nanoseconds.
         
-        # Gradual degradation after target time
-        # Score = 1 - (excess_time / target_time)
-        excess_time = actual_time - target_time
-        degradation = excess_time / target_time
+        Same curve as _calculate_response_time_score, with the breakpoints
+        scaled to nanoseconds so lookups compare integers.
         
-        # Cap the degradation so score doesn't go below 0
-        score = max(0.0, 1.0 - degradation)
+        Args:
+            actual_ns: Actual response time in nanoseconds
+            target_time: Target response time in seconds
+            
+        Returns:
+            Score between 0 and 1
+        """
+        if actual_ns <= 0 or actual_ns > self._timeout_threshold_ns:
+            return 0.0
         
-        # Additional penalty for very slow responses
-        if actual_time > self.timeout_threshold:
-            score = 0.0
+        xs, ys = self._score_tables_ns.get(target_time) or self._to_ns_table(self._build_score_table(target_time))
+        return _interpolate(xs, ys, actual_ns)
+    
+    def _build_score_table(self, target_time: float) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """Build (times, scores) breakpoints for a target time.
         
-        return score
+        Perfect score up to the target, then a linear drop of 1 - excess/target
+        that bottoms out at zero once the response takes twice the target.
+        """
+        return (target_time, 2 * target_time), (1.0, 0.0)
+    
+    def _to_ns_table(self, table: Tuple[Tuple[float, ...], Tuple[float, ...]]) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+        """Scale the times of a score table from seconds to integer nanoseconds."""
+        xs, ys = table
+        return tuple(int(x * 1e9) for x in xs), ys
     
     def _create_response_time_comment(self, actual_time: float, target_time: float, score: float) -> str:
         """Create a comment about response time performance."""
@@ -199,10 +270,7 @@ class ThroughputEvaluator(Evaluator):
         
         # Extract system type
         system_type_str = reference.get("system_type", "application")
-        try:
-            system_type = SystemType(system_type_str)
-        except ValueError:
-            system_type = SystemType.APPLICATION
+        system_type = _SYSTEM_TYPE_BY_VALUE.get(system_type_str, SystemType.APPLICATION)
         
         # Get target throughput for this system type
         target_throughput = self.target_throughput.get(system_type, 500.0)
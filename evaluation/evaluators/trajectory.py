@@ -4,18 +4,62 @@ This evaluator assesses the quality of the agent's decision-making process
 by analyzing the sequence of actions taken during log analysis.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+from operator import eq
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
 from langsmith.schemas import Example, Run
 from langsmith.evaluation import run_evaluator
 
 from ..core.interfaces import Evaluator, EvaluationMetric, EvaluationResult, SystemType
 
 
+# Log keywords that mark a complex, multi-issue scenario
+_COMPLEX_RE = re.compile(r"complex|multiple|cascading")
+
+# Log keywords that suggest documentation search is needed
+_DOC_KEYWORDS_RE = re.compile(r"unknown|unfamiliar|documentation|reference")
+
+# Default optimal trajectories for common scenarios, built once and read-only
+_DEFAULT_TRAJECTORIES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "simple_error": ("analyze_logs", "submit_analysis"),
+    "needs_documentation": ("analyze_logs", "search_documentation", "analyze_logs", "submit_analysis"),
+    "needs_user_input": ("analyze_logs", "request_additional_info", "handle_user_input", "analyze_logs", "submit_analysis"),
+    "complex_analysis": ("analyze_logs", "search_documentation", "analyze_logs", "validate_analysis"),
+    "no_issues": ("analyze_logs", "submit_analysis")
+})
+
+# Key actions an expected trajectory is scored on: the critical analysis steps
+# that should always be present, plus tool usage
+_CRITICAL_ACTIONS = frozenset({
+    "analyze_logs", "submit_analysis", "validate_analysis",
+    "search_documentation", "request_additional_info"
+})
+
+# Efficiency by trajectory length when no expected trajectory exists:
+# up to 3 steps -> 1.0, up to 5 -> 0.8, up to 7 -> 0.6, longer uses a formula
+_LENGTH_STEPS = (3, 5, 7)
+_LENGTH_STEP_SCORES = (1.0, 0.8, 0.6)
+
+# Component scores of an empty trajectory: no efficiency, neutral
+# correctness, no redundancy; the overall score uses the evaluate weighting
+_EMPTY_EFFICIENCY, _EMPTY_CORRECTNESS, _EMPTY_REDUNDANCY = 0.0, 0.5, 0.0
+_EMPTY_OVERALL = (
+    0.4 * _EMPTY_EFFICIENCY +
+    0.4 * _EMPTY_CORRECTNESS +
+    0.2 * (1.0 - _EMPTY_REDUNDANCY)
+)
+
+
 class TrajectoryEvaluator(Evaluator):
     """Evaluates the quality of agent trajectories during log analysis."""
     
     def __init__(self, 
-                 optimal_trajectories: Optional[Dict[str, List[str]]] = None,
+                 optimal_trajectories: Optional[Mapping[str, Sequence[str]]] = None,
                  penalize_redundant_actions: bool = True,
                  reward_efficient_paths: bool = True):
         """Initialize the trajectory evaluator.
@@ -25,20 +69,10 @@ class TrajectoryEvaluator(Evaluator):
             penalize_redundant_actions: Whether to penalize repeated/unnecessary actions
             reward_efficient_paths: Whether to reward shorter paths that achieve the goal
         """
-        self.optimal_trajectories = optimal_trajectories or self._get_default_trajectories()
+        self.optimal_trajectories = optimal_trajectories or _DEFAULT_TRAJECTORIES
         self.penalize_redundant_actions = penalize_redundant_actions
         self.reward_efficient_paths = reward_efficient_paths
     
-    def _get_default_trajectories(self) -> Dict[str, List[str]]:
-        """Get default optimal trajectories for common scenarios."""
-        return {
-            "simple_error": ["analyze_logs", "submit_analysis"],
-            "needs_documentation": ["analyze_logs", "search_documentation", "analyze_logs", "submit_analysis"],
-            "needs_user_input": ["analyze_logs", "request_additional_info", "handle_user_input", "analyze_logs", "submit_analysis"],
-            "complex_analysis": ["analyze_logs", "search_documentation", "analyze_logs", "validate_analysis"],
-            "no_issues": ["analyze_logs", "submit_analysis"]
-        }
-    
     def get_name(self) -> str:
         """Get the name of the evaluator."""
         return "Trajectory"
@@ -61,20 +95,45 @@ class TrajectoryEvaluator(Evaluator):
         Returns:
             EvaluationMetric with trajectory score
         """
+        return self._evaluate_sync(outputs, reference)
+    
+    def _evaluate_sync(self, outputs: Dict[str, Any], reference: Dict[str, Any]) -> EvaluationMetric:
+        """Evaluate the trajectory without an event loop; scoring never awaits."""
         # Extract trajectory from outputs
         actual_trajectory = self._extract_trajectory(outputs)
         
-        # Determine scenario type
-        scenario_type = self._identify_scenario(reference)
+        # Nothing was executed: the scores are fixed and only the comment
+        # needs the expected trajectory
+        if not actual_trajectory:
+            return EvaluationMetric(
+                key="trajectory",
+                value=0,
+                score=_EMPTY_OVERALL,
+                comment=self._create_comment(
+                    actual_trajectory,
+                    self._get_expected_trajectory(reference),
+                    _EMPTY_EFFICIENCY,
+                    _EMPTY_CORRECTNESS,
+                    _EMPTY_REDUNDANCY,
+                    _EMPTY_OVERALL
+                ),
+                result=EvaluationResult.FAILED
+            )
         
         # Get expected trajectory
-        expected_trajectory = reference.get("expected_trajectory") or \
-                            self.optimal_trajectories.get(scenario_type, [])
+        expected_trajectory = self._get_expected_trajectory(reference)
         
-        # Calculate trajectory metrics
+        # Collect trajectory statistics once, then derive the metrics from them
+        key_count, found, ordered, redundant, excessive = self._analyze_trajectory(
+            actual_trajectory, expected_trajectory
+        )
         efficiency_score = self._calculate_efficiency(actual_trajectory, expected_trajectory)
-        correctness_score = self._calculate_correctness(actual_trajectory, expected_trajectory)
-        redundancy_penalty = self._calculate_redundancy_penalty(actual_trajectory)
+        correctness_score = self._calculate_correctness(
+            actual_trajectory, expected_trajectory, key_count, found, ordered
+        )
+        redundancy_penalty = self._calculate_redundancy_penalty(
+            actual_trajectory, redundant, excessive
+        )
         
         # Calculate overall score
         overall_score = (
@@ -96,7 +155,8 @@ class TrajectoryEvaluator(Evaluator):
             expected_trajectory,
             efficiency_score,
             correctness_score,
-            redundancy_penalty
+            redundancy_penalty,
+            overall_score
         )
         
         return EvaluationMetric(
@@ -116,19 +176,40 @@ class TrajectoryEvaluator(Evaluator):
         if "execution_trace" in outputs:
             return outputs["execution_trace"]
         
-        # Try to reconstruct from messages or events
+        # Try to reconstruct from messages or events; messages are expected to
+        # be dicts, so only fall back to type checks when one is not
         if "messages" in outputs:
-            trajectory = []
-            for msg in outputs["messages"]:
-                if isinstance(msg, dict) and "node" in msg:
-                    trajectory.append(msg["node"])
-            return trajectory
+            messages = outputs["messages"]
+            try:
+                return [msg["node"] for msg in messages if "node" in msg]
+            except TypeError:
+                return [msg["node"] for msg in messages if isinstance(msg, dict) and "node" in msg]
         
         # Default empty trajectory
         return []
     
+    def _get_expected_trajectory(self, reference: Dict[str, Any]) -> Sequence[str]:
+        """Get the expected trajectory, falling back to the scenario's optimal one."""
+        return reference.get("expected_trajectory") or \
+               self.optimal_trajectories.get(self._identify_scenario(reference), [])
+    
     def _identify_scenario(self, reference: Dict[str, Any]) -> str:
-        """Identify the scenario type from reference data."""
+        """Identify the scenario type from reference data.
+        
+        Reads these optional reference keys rather than scanning the whole
+        reference as text:
+        
+        - scenario: explicit scenario name, used when it is a known scenario
+        - issues: expected issues; none means "no_issues"
+        - log_content: complex/multiple/cascading mark "complex_analysis";
+          documentation or user_input/additional_info mentions count as below
+        - needs_documentation / needs_user_input: boolean flags
+        - tools_used: tool names expected in the run, e.g. "search_documentation"
+        """
+        scenario = reference.get("scenario")
+        if scenario in self.optimal_trajectories:
+            return scenario
+        
         log_content = reference.get("log_content", "").lower()
         expected_issues = reference.get("issues", [])
         
@@ -136,13 +217,18 @@ class TrajectoryEvaluator(Evaluator):
         if not expected_issues:
             return "no_issues"
         
-        if any(keyword in log_content for keyword in ["complex", "multiple", "cascading"]):
+        if _COMPLEX_RE.search(log_content):
             return "complex_analysis"
         
-        if "documentation" in str(reference):
+        tools_used = reference.get("tools_used") or ()
+        
+        if reference.get("needs_documentation") or "documentation" in log_content or \
+                any("documentation" in tool for tool in tools_used):
             return "needs_documentation"
         
-        if "user_input" in str(reference) or "additional_info" in str(reference):
+        if reference.get("needs_user_input") or \
+                "user_input" in log_content or "additional_info" in log_content or \
+                any("user_input" in tool or "additional_info" in tool for tool in tools_used):
             return "needs_user_input"
         
         return "simple_error"
@@ -155,96 +241,79 @@ class TrajectoryEvaluator(Evaluator):
         if not expected:
             # No expected trajectory, use heuristic
             # Penalize very long trajectories
-            if len(actual) <= 3:
-                return 1.0
-            elif len(actual) <= 5:
-                return 0.8
-            elif len(actual) <= 7:
-                return 0.6
-            else:
-                return max(0.3, 1.0 - (len(actual) - 7) * 0.1)
+            step = bisect_left(_LENGTH_STEPS, len(actual))
+            if step < len(_LENGTH_STEPS):
+                return _LENGTH_STEP_SCORES[step]
+            return max(0.3, 1.0 - (len(actual) - 7) * 0.1)
         
         # Compare lengths
-        length_ratio = len(expected) / len(actual) if len(actual) > 0 else 0
-        return min(1.0, length_ratio)
+        return min(1.0, len(expected) / len(actual))
     
-    def _calculate_correctness(self, actual: List[str], expected: List[str]) -> float:
-        """Calculate correctness score based on action sequence matching."""
-        if not actual or not expected:
-            return 0.5  # Neutral score if no comparison possible
+    def _analyze_trajectory(self, actual: List[str],
+                            expected: Sequence[str]) -> Tuple[int, int, int, int, int]:
+        """Collect the statistics the correctness and redundancy scores use.
         
-        # Check if key actions are present
-        key_actions = self._extract_key_actions(expected)
-        found_actions = sum(1 for action in key_actions if action in actual)
+        Counter(actual) is the only walk that needs per-action state: its keys
+        answer membership, its values give repeat counts, and its insertion
+        order ranks actions by first occurrence, which orders them exactly as
+        their first positions would.
         
-        if not key_actions:
-            return 1.0
+        Returns:
+            Tuple of (key action count, key actions found, ordered key action
+            pairs, consecutive repeats, excessive repeats)
+        """
+        action_counts = Counter(actual)
         
-        action_coverage = found_actions / len(key_actions)
+        # Key actions present, and consecutive pairs whose first occurrences are in order
+        key_actions = self._extract_key_actions(expected)
+        found = sum(1 for action in key_actions if action in action_counts)
+        first_rank = {action: rank for rank, action in enumerate(action_counts)}
+        ranks = [first_rank.get(action, math.inf) for action in key_actions]
+        ordered = sum(1 for current, following in zip(ranks, ranks[1:])
+                      if current < following and current != math.inf)
         
-        # Check order preservation for key actions
-        order_score = self._calculate_order_preservation(actual, key_actions)
+        if not self.penalize_redundant_actions:
+            return len(key_actions), found, ordered, 0, 0
         
-        return 0.6 * action_coverage + 0.4 * order_score
-    
-    def _extract_key_actions(self, trajectory: List[str]) -> List[str]:
-        """Extract key actions that must be present."""
-        key_actions = []
-        
-        for action in trajectory:
-            # These are critical actions that should always be present
-            if action in ["analyze_logs", "submit_analysis", "validate_analysis"]:
-                key_actions.append(action)
-            # Tool usage is important
-            elif action in ["search_documentation", "request_additional_info"]:
-                key_actions.append(action)
+        # Repeated consecutive actions, and actions repeated more than necessary (excessive loops)
+        redundant = sum(map(eq, actual, islice(actual, 1, None)))
+        excessive = sum(count - 2 for count in action_counts.values() if count > 2)
         
-        return key_actions
+        return len(key_actions), found, ordered, redundant, excessive
     
-    def _calculate_order_preservation(self, actual: List[str], key_actions: List[str]) -> float:
-        """Calculate how well the order of key actions is preserved."""
-        if not key_actions:
+    def _calculate_correctness(self, actual: List[str], expected: Sequence[str],
+                               key_count: int, found: int, ordered: int) -> float:
+        """Calculate correctness score based on action sequence matching."""
+        if not actual or not expected:
+            return 0.5  # Neutral score if no comparison possible
+        
+        if not key_count:
             return 1.0
         
-        # Find positions of key actions in actual trajectory
-        positions = []
-        for action in key_actions:
-            if action in actual:
-                positions.append(actual.index(action))
-            else:
-                positions.append(float('inf'))
+        action_coverage = found / key_count
         
-        # Check if positions are in increasing order
-        ordered_count = sum(1 for i in range(len(positions) - 1) 
-                          if positions[i] < positions[i + 1] and positions[i] != float('inf'))
+        # Order preservation for key actions
+        max_possible = key_count - 1
+        order_score = ordered / max_possible if max_possible > 0 else 1.0
         
-        max_possible = len(key_actions) - 1
-        return ordered_count / max_possible if max_possible > 0 else 1.0
+        return 0.6 * action_coverage + 0.4 * order_score
     
-    def _calculate_redundancy_penalty(self, trajectory: List[str]) -> float:
+    def _extract_key_actions(self, trajectory: Sequence[str]) -> List[str]:
+        """Extract key actions that must be present."""
+        return [action for action in trajectory if action in _CRITICAL_ACTIONS]
+    
+    def _calculate_redundancy_penalty(self, trajectory: List[str],
+                                      redundant: int, excessive: int) -> float:
         """Calculate penalty for redundant actions."""
         if not self.penalize_redundant_actions or len(trajectory) <= 1:
             return 0.0
         
-        # Count repeated consecutive actions
-        redundant_count = 0
-        for i in range(1, len(trajectory)):
-            if trajectory[i] == trajectory[i-1]:
-                redundant_count += 1
-        
-        # Count excessive loops
-        action_counts = {}
-        for action in trajectory:
-            action_counts[action] = action_counts.get(action, 0) + 1
-        
-        # Penalize actions repeated more than necessary
-        excessive_repeats = sum(max(0, count - 2) for count in action_counts.values())
-        
-        total_penalty = (redundant_count + excessive_repeats) / len(trajectory)
+        total_penalty = (redundant + excessive) / len(trajectory)
         return min(1.0, total_penalty)
     
     def _create_comment(self, actual: List[str], expected: List[str], 
-                       efficiency: float, correctness: float, redundancy: float) -> str:
+                       efficiency: float, correctness: float, redundancy: float,
+                       overall: float) -> str:
         """Create a detailed comment about the trajectory evaluation."""
         comments = []
         
@@ -261,7 +330,6 @@ class TrajectoryEvaluator(Evaluator):
             comments.append(f"Redundancy penalty: {redundancy:.2f}")
         
         # Performance assessment
-        overall = (0.4 * efficiency + 0.4 * correctness + 0.2 * (1.0 - redundancy))
         if overall >= 0.8:
             performance = "Excellent"
         elif overall >= 0.6:
@@ -284,11 +352,13 @@ class TrajectoryEvaluator(Evaluator):
         return f"{performance} trajectory. {' | '.join(comments)}"
 
 
+# Shared default evaluator for the LangSmith wrappers; it holds no per-run state
+_TRAJECTORY_EVAL = TrajectoryEvaluator()
+
+
 @run_evaluator
 def evaluate_trajectory(run: Run, example: Example) -> Dict[str, Any]:
     """LangSmith-compatible trajectory evaluator function."""
-    evaluator = TrajectoryEvaluator()
-    
     # Extract trajectory from run
     trajectory = []
     
@@ -315,12 +385,13 @@ def evaluate_trajectory(run: Run, example: Example) -> Dict[str, Any]:
     reference = {
         'log_content': example.inputs.get('log_content', ''),
         'expected_trajectory': example.outputs.get('expected_trajectory', []),
-        'issues': example.outputs.get('analysis_result', {}).get('issues', [])
+        'issues': example.outputs.get('analysis_result', {}).get('issues', []),
+        'needs_documentation': example.outputs.get('needs_documentation', False),
+        'needs_user_input': example.outputs.get('needs_user_input', False)
     }
     
-    # Run evaluation
-    import asyncio
-    metric = asyncio.run(evaluator.evaluate(outputs, reference))
+    # Run evaluation; scoring is CPU-only, so skip spinning up an event loop per run
+    metric = _TRAJECTORY_EVAL._evaluate_sync(outputs, reference)
     
     return {
         'key': metric.key,
@@ -343,8 +414,7 @@ def evaluate_tool_usage(run: Run, example: Example) -> Dict[str, Any]:
     
     # Check if documentation search was needed
     log_content = example.inputs.get('log_content', '').lower()
-    needs_doc_search = any(keyword in log_content for keyword in 
-                          ['unknown', 'unfamiliar', 'documentation', 'reference'])
+    needs_doc_search = _DOC_KEYWORDS_RE.search(log_content) is not None
     
     # Check if user input was needed
     needs_user_input = example.outputs.get('needs_user_input', False)
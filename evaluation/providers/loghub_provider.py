@@ -1,12 +1,17 @@
 """LogHub dataset provider for evaluation framework."""
 
 import os
+import csv
 import json
+import pickle
+import shutil
 import tarfile
+import threading
 import zipfile
-from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from pathlib import Path
-# import pandas as pd  # Commented out - only needed when actually loading LogHub datasets
 import numpy as np
 from urllib.parse import urlparse
 import requests
@@ -15,6 +20,40 @@ from tqdm import tqdm
 from ..core.interfaces import DatasetProvider, LogEntry, SystemType
 
 
+# Download in 1 MiB chunks and write through a 1 MiB buffer, so large archives
+# cost few Python loop iterations, progress updates and write syscalls
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Report download progress in 8 MiB steps and redraw at most twice a second
+_PROGRESS_UPDATE_BYTES = 8 << 20
+_PROGRESS_MIN_INTERVAL = 0.5
+
+# Archives larger than one segment are fetched as parallel HTTP Range requests
+_RANGE_SEGMENT_SIZE = 64 << 20
+_MAX_RANGE_WORKERS = 8
+
+# Seconds to wait on the size check made before an archive is downloaded or reused
+_PROBE_TIMEOUT = 10
+
+# Copy extracted tar members through a 1 MiB buffer instead of the 16 KiB default
+_EXTRACT_BUFFER_SIZE = 1 << 20
+
+# Read log files through a 1 MiB buffer to amortize read syscalls
+_READ_BUFFER_SIZE = 1 << 20
+
+# Upper bound on datasets fetched and extracted at once by LogHubMultiProvider
+_MAX_PARALLEL_DATASETS = 8
+
+# Bumped whenever the pickled layout of cached samples changes (v2: slotted LogEntry)
+_SAMPLES_CACHE_VERSION = 2
+
+
+def _advise_sequential(f) -> None:
+    """Hint the OS to read ahead aggressively on a file read start to end."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
 class LogHubProvider(DatasetProvider):
     """Dataset provider for LogHub datasets."""
     
@@ -117,6 +156,12 @@ class LogHubProvider(DatasetProvider):
         }
     }
     
+    # Shared by all instances, so providers for the same data directory never
+    # download or extract the same archive twice, even from parallel threads
+    _path_locks: Dict[Path, threading.Lock] = {}
+    _downloaded_archives: Set[Path] = set()
+    _extracted_dirs: Set[Path] = set()
+    
     def __init__(self, dataset_name: str, data_dir: str = "data/loghub", cache_dir: str = "cache"):
         """Initialize LogHub dataset provider.
         
@@ -148,34 +193,76 @@ class LogHubProvider(DatasetProvider):
         """Get the system types supported by this provider."""
         return [self.dataset_info["system_type"]]
     
+    def _path_lock(self, path: Path) -> threading.Lock:
+        """Get the process-wide lock guarding a download or extraction target."""
+        # setdefault is atomic, so concurrent callers always share one lock
+        return self._path_locks.setdefault(path, threading.Lock())
+    
     def _download_dataset(self, force_download: bool = False) -> Path:
-        """Download dataset from Zenodo if not already present."""
+        """Download dataset from Zenodo if not already present.
+        
+        The archive is left alone once the dataset is extracted, since it is not
+        read again; a forced download discards the extraction so the fresh
+        archive is extracted in its place.
+        """
         file_path = self.data_dir / self.dataset_info["file_name"]
+        archive_key = file_path.resolve()
         
-        if file_path.exists() and not force_download:
-            return file_path
+        with self._path_lock(archive_key):
+            # Archives already checked by this process, or already extracted, skip the size probe
+            if not force_download and (archive_key in self._downloaded_archives or self._get_extract_dir().exists()):
+                return file_path
+            
+            self._fetch_archive(file_path, force_download)
+            self._downloaded_archives.add(archive_key)
+            
+            if force_download:
+                self._discard_extraction()
         
+        return file_path
+    
+    def _discard_extraction(self) -> None:
+        """Remove the extracted dataset so the next load extracts the archive again."""
+        extract_dir = self._get_extract_dir()
+        extract_key = extract_dir.resolve()
+        
+        with self._path_lock(extract_key):
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            self._extracted_dirs.discard(extract_key)
+    
+    def _fetch_archive(self, file_path: Path, force_download: bool) -> Path:
+        """Download the archive to file_path unless a complete copy is already there."""
         zenodo_url = f"https://zenodo.org/records/{self.dataset_info['zenodo_id']}/files/{self.dataset_info['file_name']}"
         
-        print(f"Downloading {self.dataset_name} dataset from Zenodo...")
+        # Probed once, both to check an existing archive and to plan a download
+        total_size, accepts_ranges = self._probe_archive(zenodo_url)
         
-        try:
-            response = requests.get(zenodo_url, stream=True)
-            response.raise_for_status()
+        resume_from = 0
+        if file_path.exists() and not force_download:
+            # Keep the archive unless the server reports a different size; if it
+            # cannot be reached, trust the file (e.g. placed there manually)
+            existing_size = file_path.stat().st_size
+            if not total_size or existing_size == total_size:
+                return file_path
             
-            total_size = int(response.headers.get('content-length', 0))
+            # A shorter file is a truncated earlier download; continue it if possible
+            if accepts_ranges and existing_size < total_size:
+                resume_from = existing_size
+                print(f"Resuming {self.dataset_name} dataset download from Zenodo...")
+        
+        if not resume_from:
+            print(f"Downloading {self.dataset_name} dataset from Zenodo...")
+        
+        try:
+            if resume_from:
+                downloaded = self._download_resume(zenodo_url, file_path, resume_from, total_size)
+            else:
+                # Large archives on servers that accept ranges download in parallel segments
+                downloaded = accepts_ranges and total_size > _RANGE_SEGMENT_SIZE and \
+                    self._download_ranges(zenodo_url, file_path, total_size)
             
-            with open(file_path, 'wb') as f, tqdm(
-                desc=self.dataset_info["file_name"],
-                total=total_size,
-                unit='B',
-                unit_scale=True,
-                unit_divisor=1024,
-            ) as progress_bar:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        progress_bar.update(len(chunk))
+            if not downloaded:
+                self._download_stream(zenodo_url, file_path)
             
             print(f"Downloaded {self.dataset_name} dataset to {file_path}")
             return file_path
@@ -187,56 +274,331 @@ class LogHubProvider(DatasetProvider):
             print(f"And place it in {self.data_dir}")
             raise
     
+    def _probe_archive(self, url: str) -> Tuple[int, bool]:
+        """Get the archive's size and whether the server accepts byte ranges.
+        
+        Returns:
+            (0, False) if the size is unknown or the server cannot be reached
+        """
+        try:
+            head = requests.head(url, allow_redirects=True, timeout=_PROBE_TIMEOUT)
+        except requests.RequestException:
+            return 0, False
+        
+        if not head.ok:
+            return 0, False
+        return int(head.headers.get('content-length', 0)), head.headers.get('accept-ranges') == 'bytes'
+    
+    def _progress_bar(self, total_size: int, initial: int = 0) -> tqdm:
+        """Create a download progress bar for the dataset archive."""
+        return tqdm(
+            desc=self.dataset_info["file_name"],
+            total=total_size,
+            initial=initial,
+            unit='B',
+            unit_scale=True,
+            unit_divisor=1024,
+            mininterval=_PROGRESS_MIN_INTERVAL,
+        )
+    
+    def _write_response(self, response: requests.Response, f, progress_bar: tqdm) -> None:
+        """Write a streamed response body to f, batching progress updates."""
+        pending = 0
+        for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+            if chunk:
+                f.write(chunk)
+                pending += len(chunk)
+                if pending >= _PROGRESS_UPDATE_BYTES:
+                    progress_bar.update(pending)
+                    pending = 0
+        progress_bar.update(pending)
+    
+    def _download_stream(self, url: str, file_path: Path) -> None:
+        """Download the archive as a single streamed request."""
+        response = requests.get(url, stream=True)
+        response.raise_for_status()
+        
+        total_size = int(response.headers.get('content-length', 0))
+        
+        with open(file_path, 'wb', buffering=_DOWNLOAD_CHUNK_SIZE) as f, \
+                self._progress_bar(total_size) as progress_bar:
+            self._write_response(response, f, progress_bar)
+    
+    def _download_resume(self, url: str, file_path: Path, offset: int, total_size: int) -> bool:
+        """Append the rest of a truncated archive with an HTTP Range request.
+        
+        Returns:
+            False if the server ignored the range request, in which case the
+            caller should download the archive again from the start
+        """
+        response = requests.get(url, headers={'Range': f'bytes={offset}-'}, stream=True)
+        with response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                return False
+            
+            with open(file_path, 'ab', buffering=_DOWNLOAD_CHUNK_SIZE) as f, \
+                    self._progress_bar(total_size, initial=offset) as progress_bar:
+                self._write_response(response, f, progress_bar)
+        return True
+    
+    def _download_ranges(self, url: str, file_path: Path, total_size: int) -> bool:
+        """Download the archive as parallel HTTP Range requests.
+        
+        Segments are written at their own offsets into a preallocated part
+        file, which only replaces the archive once every segment completed;
+        an interrupted download so never leaves a full-size archive with holes.
+        
+        Returns:
+            False if the server ignored a range request, in which case the
+            caller should fall back to a single streamed download
+        """
+        segments = [
+            (start, min(start + _RANGE_SEGMENT_SIZE, total_size) - 1)
+            for start in range(0, total_size, _RANGE_SEGMENT_SIZE)
+        ]
+        
+        part_path = file_path.with_name(f"{file_path.name}.part")
+        # Only os.replace may leave a file behind, whatever fails on the way
+        try:
+            with open(part_path, 'wb') as f:
+                f.truncate(total_size)
+            
+            with self._progress_bar(total_size) as progress_bar:
+                def download_segment(segment: Tuple[int, int]) -> bool:
+                    start, end = segment
+                    response = requests.get(url, headers={'Range': f'bytes={start}-{end}'}, stream=True)
+                    with response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            return False
+                        
+                        with open(part_path, 'r+b', buffering=_DOWNLOAD_CHUNK_SIZE) as f:
+                            f.seek(start)
+                            self._write_response(response, f, progress_bar)
+                    return True
+                
+                with ThreadPoolExecutor(max_workers=min(_MAX_RANGE_WORKERS, len(segments))) as executor:
+                    completed = all(list(executor.map(download_segment, segments)))
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+        
+        if not completed:
+            part_path.unlink()
+            return False
+        
+        os.replace(part_path, file_path)
+        return True
+    
+    def _get_extract_dir(self) -> Path:
+        """Get the directory the dataset archive is extracted to."""
+        return self.data_dir / f"{self.dataset_name}_extracted"
+    
+    def _get_samples_cache_path(self) -> Path:
+        """Get the path of the on-disk cache of fully loaded samples."""
+        return self.cache_dir / f"{self.dataset_name}.samples.pkl"
+    
+    def _get_source_fingerprint(self) -> Optional[Dict[str, Any]]:
+        """Identify the extracted log file by path, size and modification time.
+        
+        Returns:
+            None if the dataset is not extracted or has no log file
+        """
+        extract_dir = self._get_extract_dir()
+        if not extract_dir.is_dir():
+            return None
+        
+        log_file = self._get_log_file(extract_dir)
+        if log_file is None:
+            return None
+        
+        try:
+            stat = log_file.stat()
+        except OSError:
+            return None
+        return {"path": str(log_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    
+    def _read_samples_cache(self) -> Optional[Tuple[List[LogEntry], Dict[str, Any]]]:
+        """Read samples and metadata pickled by an earlier full load, if any.
+        
+        The cache is ignored when it was written for a different data directory,
+        by a version with a different sample layout, or from a log file that has
+        since been replaced. Delete the cache file to force the log to be parsed again.
+        """
+        cache_path = self._get_samples_cache_path()
+        if not cache_path.exists():
+            return None
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read samples cache {cache_path}: {e}")
+            return None
+        
+        if not isinstance(cached, dict) or cached.get("version") != _SAMPLES_CACHE_VERSION:
+            return None
+        if cached.get("source_file") != str(self._get_extract_dir()):
+            return None
+        
+        source_fingerprint = cached.get("source_fingerprint")
+        if source_fingerprint is None or source_fingerprint != self._get_source_fingerprint():
+            return None
+        return cached["samples"], cached["metadata"]
+    
+    def _load_samples_cache(self) -> bool:
+        """Adopt samples from the on-disk cache if it is still valid.
+        
+        Returns:
+            True if the samples are now held in memory
+        """
+        if self._samples_cache is not None:
+            return True
+        
+        cached = self._read_samples_cache()
+        if cached is None:
+            return False
+        
+        self._samples_cache, self._metadata_cache = cached
+        return True
+    
+    def _write_samples_cache(self, samples: List[LogEntry], metadata: Dict[str, Any]) -> None:
+        """Pickle fully loaded samples and metadata for later processes."""
+        cache_path = self._get_samples_cache_path()
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump({
+                    "version": _SAMPLES_CACHE_VERSION,
+                    "source_file": str(self._get_extract_dir()),
+                    "source_fingerprint": self._get_source_fingerprint(),
+                    "samples": samples,
+                    "metadata": metadata
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Replace atomically so concurrent loads never see a partial cache
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            print(f"Warning: Could not write samples cache {cache_path}: {e}")
+            temp_path.unlink(missing_ok=True)
+    
     def _extract_dataset(self, archive_path: Path) -> Path:
         """Extract the dataset archive."""
-        extract_dir = self.data_dir / f"{self.dataset_name}_extracted"
+        extract_dir = self._get_extract_dir()
+        extract_key = extract_dir.resolve()
         
-        if extract_dir.exists():
-            return extract_dir
+        with self._path_lock(extract_key):
+            if extract_key not in self._extracted_dirs:
+                if not extract_dir.exists():
+                    self._extract_archive(archive_path, extract_dir)
+                self._extracted_dirs.add(extract_key)
         
+        return extract_dir
+    
+    def _extract_archive(self, archive_path: Path, extract_dir: Path) -> None:
+        """Extract the archive into extract_dir."""
         print(f"Extracting {archive_path}...")
         
+        # Extract into a staging directory of our own, so the result is found
+        # without scanning data_dir and an interrupted extraction is redone
+        staging_dir = self.data_dir / f"{self.dataset_name}_extracting"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir()
+        
         if archive_path.suffix == '.gz':
-            with tarfile.open(archive_path, 'r:gz') as tar:
-                tar.extractall(self.data_dir)
+            with tarfile.open(archive_path, 'r:gz', copybufsize=_EXTRACT_BUFFER_SIZE) as tar:
+                tar.extractall(staging_dir)
         elif archive_path.suffix == '.zip':
             with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                zip_ref.extractall(self.data_dir)
+                zip_ref.extractall(staging_dir)
         else:
             raise ValueError(f"Unsupported archive format: {archive_path.suffix}")
         
-        # Find the extracted directory
-        for item in self.data_dir.iterdir():
-            if item.is_dir() and item.name != "cache" and self.dataset_name.lower() in item.name.lower():
-                if item != extract_dir:
-                    item.rename(extract_dir)
-                return extract_dir
+        # Archives usually wrap everything in one top-level directory; flat ones don't
+        with os.scandir(staging_dir) as entries:
+            top_level = list(entries)
+        
+        if not top_level:
+            shutil.rmtree(staging_dir)
+            raise FileNotFoundError(f"Could not find extracted directory for {self.dataset_name}")
         
-        raise FileNotFoundError(f"Could not find extracted directory for {self.dataset_name}")
+        if len(top_level) == 1 and top_level[0].is_dir():
+            Path(top_level[0].path).rename(extract_dir)
+            staging_dir.rmdir()
+        else:
+            staging_dir.rename(extract_dir)
+    
+    def _find_log_file(self, extract_dir: Path) -> Optional[Path]:
+        """Find the first .log file in the extracted directory, if any."""
+        with os.scandir(extract_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".log"):
+                    return Path(entry.path)
+        return None
     
-    def _load_log_file(self, log_file: Path) -> List[str]:
-        """Load log entries from a log file."""
+    def _iter_log_file(self, log_file: Path) -> Iterator[str]:
+        """Lazily yield log entries from a log file, stripped and without blank lines.
+        
+        The file is read as UTF-8; if it turns out not to be, reading switches
+        to latin1 for the lines after those already yielded.
+        """
+        yielded = 0
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            with open(log_file, 'r', encoding='utf-8', buffering=_READ_BUFFER_SIZE) as f:
+                _advise_sequential(f)
+                for line in map(str.strip, f):
+                    if line:
+                        yielded += 1
+                        yield line
+            return
         except UnicodeDecodeError:
-            # Try with different encoding
-            with open(log_file, 'r', encoding='latin1') as f:
-                lines = f.readlines()
+            pass
         
-        # Clean up lines
-        lines = [line.strip() for line in lines if line.strip()]
-        return lines
+        # Try with different encoding
+        with open(log_file, 'r', encoding='latin1', buffering=_READ_BUFFER_SIZE) as f:
+            _advise_sequential(f)
+            yield from islice((line for line in map(str.strip, f) if line), yielded, None)
     
-    def _parse_structured_csv(self, csv_file: Path) -> List[Dict[str, Any]]:
-        """Parse structured CSV file with log templates."""
+    def _read_csv_columns(self, csv_file: Path) -> Dict[str, List[Optional[str]]]:
+        """Read a CSV file with a header row into columns of string values.
+        
+        Uses the stdlib csv reader rather than pandas; blank lines are skipped
+        and short rows are padded with None, as csv.DictReader would.
+        """
+        with open(csv_file, 'r', encoding='utf-8', errors='replace', newline='',
+                  buffering=_READ_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            width = len(header)
+            
+            # Append each row straight into its columns, so only one copy of the data
+            # is held; a repeated header name keeps its last column, as a dict would
+            columns = {name: [] for name in header}
+            last_index = {name: index for index, name in enumerate(header)}
+            appends = [(columns[name].append, index) for name, index in last_index.items()]
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != width:
+                    row = (row + [None] * width)[:width]
+                for append, index in appends:
+                    append(row[index])
+        
+        return columns
+    
+    def _parse_structured_csv(self, csv_file: Path) -> Dict[str, List[Any]]:
+        """Parse structured CSV file with log templates.
+        
+        Returns:
+            Column name -> list of values, one per row; columns avoid
+            allocating a dict for every row of large structured logs
+        """
         try:
-            # df = pd.read_csv(csv_file)  # Commented out - pandas not available
-            raise NotImplementedError("CSV loading requires pandas. Install with: pip install pandas")
-            return df.to_dict('records')
+            return self._read_csv_columns(csv_file)
         except Exception as e:
             print(f"Warning: Could not parse {csv_file}: {e}")
-            return []
+            return {}
     
     def _load_labels(self, extract_dir: Path) -> Dict[str, Any]:
         """Load labels if available."""
@@ -254,27 +616,43 @@ class LogHubProvider(DatasetProvider):
             label_path = extract_dir / label_file
             if label_path.exists():
                 try:
-                    # df = pd.read_csv(label_path)  # Commented out - pandas not available
-                    raise NotImplementedError("CSV loading requires pandas. Install with: pip install pandas")
-                    labels[label_file] = df.to_dict('records')
+                    labels[label_file] = self._read_csv_columns(label_path)
                 except Exception as e:
                     print(f"Warning: Could not load {label_file}: {e}")
         
         return labels
     
-    def _process_dataset_specific(self, extract_dir: Path) -> Tuple[List[str], Dict[str, Any]]:
-        """Process dataset-specific files and return log entries and metadata."""
-        log_entries = []
-        metadata = {}
-        
+    def _get_log_file(self, extract_dir: Path) -> Optional[Path]:
+        """Get the dataset's log file in the extracted directory, if it exists."""
         # Dataset-specific processing
         if self.dataset_name == "HDFS":
-            # HDFS has multiple files and structured data
             log_file = extract_dir / "HDFS.log"
-            if log_file.exists():
-                log_entries = self._load_log_file(log_file)
-            
-            # Load structured data
+        elif self.dataset_name == "BGL":
+            log_file = extract_dir / "BGL.log"
+        else:
+            # Generic processing - use the first .log file found
+            log_file = self._find_log_file(extract_dir)
+        
+        if log_file is None or not log_file.exists():
+            return None
+        return log_file
+    
+    def _process_logs(self, extract_dir: Path) -> Iterable[str]:
+        """Find the dataset's log file and return its entries as a lazy iterator.
+        
+        Callers only read as much of the log file as they consume.
+        """
+        log_file = self._get_log_file(extract_dir)
+        if log_file is None:
+            return ()
+        return self._iter_log_file(log_file)
+    
+    def _process_metadata(self, extract_dir: Path) -> Dict[str, Any]:
+        """Load dataset-specific structured data, templates and labels."""
+        metadata = {}
+        
+        if self.dataset_name == "HDFS":
+            # HDFS has structured data
             structured_file = extract_dir / "HDFS.log_structured.csv"
             if structured_file.exists():
                 metadata["structured_data"] = self._parse_structured_csv(structured_file)
@@ -284,31 +662,26 @@ class LogHubProvider(DatasetProvider):
             if template_file.exists():
                 metadata["templates"] = self._parse_structured_csv(template_file)
         
-        elif self.dataset_name == "BGL":
-            # BGL has specific format
-            log_file = extract_dir / "BGL.log"
-            if log_file.exists():
-                log_entries = self._load_log_file(log_file)
-        
-        else:
-            # Generic processing - look for .log files
-            log_files = list(extract_dir.glob("*.log"))
-            if log_files:
-                log_file = log_files[0]  # Use the first log file found
-                log_entries = self._load_log_file(log_file)
-        
         # Load labels if available
         labels = self._load_labels(extract_dir)
         if labels:
             metadata["labels"] = labels
         
-        return log_entries, metadata
+        return metadata
+    
+    def _process_dataset_specific(self, extract_dir: Path) -> Tuple[Iterable[str], Dict[str, Any]]:
+        """Process dataset-specific files and return log entries and metadata."""
+        return self._process_logs(extract_dir), self._process_metadata(extract_dir)
     
     def load_samples(self, limit: Optional[int] = None) -> List[LogEntry]:
         """Load log samples from the dataset."""
         if self._samples_cache is not None and limit is None:
             return self._samples_cache
         
+        # Full loads reuse samples parsed by an earlier process
+        if limit is None and self._load_samples_cache():
+            return self._samples_cache
+        
         # Download and extract dataset
         archive_path = self._download_dataset()
         extract_dir = self._extract_dataset(archive_path)
@@ -316,26 +689,33 @@ class LogHubProvider(DatasetProvider):
         # Process dataset
         log_entries, metadata = self._process_dataset_specific(extract_dir)
         
-        # Convert to LogEntry objects
+        # Structured data is stored by column; each entry takes the values of its row
+        structured_data = metadata.get("structured_data") or {}
+        structured_columns = list(structured_data.items())
+        structured_row_count = len(structured_columns[0][1]) if structured_columns else 0
+        
+        # Fields shared by every entry, built once so all entries reference the
+        # same strings rather than each formatting its own copy of the path
+        system_type = self.dataset_info["system_type"]
+        base_metadata = {
+            "dataset": self.dataset_name,
+            "source_file": str(extract_dir)
+        }
+        
+        # Convert to LogEntry objects, reading no further into the log than the limit
         samples = []
-        for i, content in enumerate(log_entries):
-            if limit is not None and i >= limit:
-                break
-            
+        for i, content in enumerate(islice(log_entries, limit)):
             # Create metadata for this entry
-            entry_metadata = {
-                "index": i,
-                "dataset": self.dataset_name,
-                "source_file": str(extract_dir)
-            }
+            entry_metadata = {"index": i, **base_metadata}
             
             # Add any additional metadata
-            if "structured_data" in metadata and i < len(metadata["structured_data"]):
-                entry_metadata.update(metadata["structured_data"][i])
+            if i < structured_row_count:
+                for column, values in structured_columns:
+                    entry_metadata[column] = values[i]
             
             sample = LogEntry(
                 content=content,
-                system_type=self.dataset_info["system_type"],
+                system_type=system_type,
                 dataset=self.dataset_name,
                 metadata=entry_metadata
             )
@@ -345,19 +725,19 @@ class LogHubProvider(DatasetProvider):
         if limit is None:
             self._samples_cache = samples
             self._metadata_cache = metadata
+            self._write_samples_cache(samples, metadata)
         
         return samples
     
     def get_metadata(self) -> Dict[str, Any]:
         """Get metadata about the dataset."""
         if self._metadata_cache is None:
-            # Load samples to populate metadata cache
-            self.load_samples(limit=1)
+            # Download and extract dataset, reading only the metadata files
+            archive_path = self._download_dataset()
+            self._metadata_cache = self._process_metadata(self._extract_dataset(archive_path))
         
-        # Download and extract dataset to get full metadata
-        archive_path = self._download_dataset()
-        extract_dir = self._extract_dataset(archive_path)
-        _, metadata = self._process_dataset_specific(extract_dir)
+        metadata = self._metadata_cache
+        extract_dir = self._get_extract_dir()
         
         # Basic metadata
         result = {
@@ -406,10 +786,30 @@ class LogHubMultiProvider(DatasetProvider):
             system_types.update(provider.get_system_types())
         return list(system_types)
     
+    def _prepare_datasets(self) -> None:
+        """Download, then extract, all datasets that are not loaded yet concurrently.
+        
+        Downloads are network-bound and each dataset uses its own archive and
+        extraction directory, so they overlap safely; sample conversion stays
+        serial in load_samples.
+        """
+        # Only datasets without a valid samples cache need their archive
+        pending = [provider for provider in self.providers if not provider._load_samples_cache()]
+        if len(pending) < 2:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_DATASETS, len(pending))) as executor:
+            archive_paths = list(executor.map(lambda provider: provider._download_dataset(), pending))
+            list(executor.map(lambda provider, archive_path: provider._extract_dataset(archive_path),
+                              pending, archive_paths))
+    
     def load_samples(self, limit: Optional[int] = None) -> List[LogEntry]:
         """Load log samples from all datasets."""
         all_samples = []
         
+        # Fetch archives up front in parallel; per-provider loads then find them on disk
+        self._prepare_datasets()
+        
         for provider in self.providers:
             samples = provider.load_samples()
             all_samples.extend(samples)
@@ -9,9 +9,47 @@ import asyncio
 import subprocess
 import sys
 import os
+import threading
 from pathlib import Path
 
 
+def run_command(cmd, env=None):
+    """Run a command with its output streamed to this terminal; return its exit code."""
+    return subprocess.run(cmd, env=env).returncode
+
+
+def run_commands_concurrently(commands):
+    """Run (label, cmd, env) commands at once, streaming output lines tagged with their label.
+    
+    Returns:
+        Exit codes in the same order as the commands
+    """
+    output_lock = threading.Lock()
+    
+    def relay(label, stream):
+        for line in stream:
+            with output_lock:
+                sys.stdout.write(f"[{label}] {line}")
+                sys.stdout.flush()
+    
+    processes = []
+    relays = []
+    for label, cmd, env in commands:
+        # Unbuffered children, so their lines arrive as they are printed
+        child_env = dict(env if env is not None else os.environ, PYTHONUNBUFFERED="1")
+        process = subprocess.Popen(
+            cmd, env=child_env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+        relay_thread = threading.Thread(target=relay, args=(label, process.stdout), daemon=True)
+        relay_thread.start()
+        processes.append(process)
+        relays.append(relay_thread)
+    
+    for relay_thread in relays:
+        relay_thread.join()
+    return [process.wait() for process in processes]
+
+
 def create_dataset(args):
     """Create a new evaluation dataset in LangSmith."""
     print("Creating evaluation dataset...")
@@ -28,13 +66,11 @@ def create_dataset(args):
         print(f"Number of samples: {args.samples}")
         # The create_langsmith_dataset.py script would need to be updated to accept this parameter
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0:
+    returncode = run_command(cmd)
+    if returncode == 0:
         print("Dataset created successfully!")
-        print(result.stdout)
     else:
-        print("Error creating dataset:")
-        print(result.stderr)
+        print(f"Error creating dataset (exit code {returncode})")
         sys.exit(1)
 
 
@@ -80,13 +116,10 @@ def evaluate(args):
     if args.use_improved:
         env["USE_IMPROVED_LOG_ANALYZER"] = "true"
     
-    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    returncode = run_command(cmd, env=env)
     
-    if result.returncode == 0:
-        print(result.stdout)
-    else:
-        print("Error running evaluation:")
-        print(result.stderr)
+    if returncode != 0:
+        print(f"Error running evaluation (exit code {returncode})")
         sys.exit(1)
 
 
@@ -94,11 +127,7 @@ def compare(args):
     """Run comparative evaluation between configurations."""
     print("Running comparative evaluation...")
     
-    # Run evaluation for original implementation
-    print("\n" + "="*60)
-    print("Evaluating ORIGINAL implementation")
-    print("="*60)
-    
+    # Evaluation for original implementation
     original_cmd = [
         sys.executable,
         "evaluation/scripts/evaluate_agent_consolidated.py",
@@ -110,19 +139,7 @@ def compare(args):
     if args.max_examples:
         original_cmd.extend(["--max-examples", str(args.max_examples)])
     
-    original_result = subprocess.run(original_cmd, capture_output=True, text=True)
-    
-    if original_result.returncode == 0:
-        print(original_result.stdout)
-    else:
-        print("Error evaluating original:")
-        print(original_result.stderr)
-    
-    # Run evaluation for improved implementation
-    print("\n" + "="*60)
-    print("Evaluating IMPROVED implementation")
-    print("="*60)
-    
+    # Evaluation for improved implementation
     improved_cmd = [
         sys.executable,
         "evaluation/scripts/evaluate_agent_consolidated.py",
@@ -134,16 +151,31 @@ def compare(args):
     if args.max_examples:
         improved_cmd.extend(["--max-examples", str(args.max_examples)])
     
+    # Both runs hit the same LLM provider at once, so each gets half of the combined limits
+    child_limits = [
+        "--max-concurrency", str(max(1, args.max_concurrency // 2)),
+        "--rate-per-sec", str(args.rate_per_sec / 2)
+    ]
+    original_cmd.extend(child_limits)
+    improved_cmd.extend(child_limits)
+    
     env = os.environ.copy()
     env["USE_IMPROVED_LOG_ANALYZER"] = "true"
     
-    improved_result = subprocess.run(improved_cmd, env=env, capture_output=True, text=True)
+    # The two evaluations are independent, so run them side by side
+    print("\n" + "="*60)
+    print("Evaluating ORIGINAL and IMPROVED implementations concurrently")
+    print("="*60)
     
-    if improved_result.returncode == 0:
-        print(improved_result.stdout)
-    else:
-        print("Error evaluating improved:")
-        print(improved_result.stderr)
+    original_returncode, improved_returncode = run_commands_concurrently([
+        ("original", original_cmd, None),
+        ("improved", improved_cmd, env)
+    ])
+    
+    if original_returncode != 0:
+        print(f"Error evaluating original (exit code {original_returncode})")
+    if improved_returncode != 0:
+        print(f"Error evaluating improved (exit code {improved_returncode})")
     
     print("\n" + "="*60)
     print("COMPARISON SUMMARY")
@@ -163,13 +195,10 @@ def benchmark(args):
         if args.benchmark_type:
             cmd.extend(["--type", args.benchmark_type])
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        returncode = run_command(cmd)
         
-        if result.returncode == 0:
-            print(result.stdout)
-        else:
-            print("Error running benchmarks:")
-            print(result.stderr)
+        if returncode != 0:
+            print(f"Error running benchmarks (exit code {returncode})")
             sys.exit(1)
     else:
         print("Benchmark runner not found. Creating basic benchmark...")
@@ -308,6 +337,18 @@ Examples:
         default='comparison',
         help='Suffix for experiment names (default: comparison)'
     )
+    compare_parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=int(os.getenv('EVAL_MAX_CONCURRENCY', '32')),
+        help='Maximum examples in flight across both runs; each run gets half (default: 32, env: EVAL_MAX_CONCURRENCY)'
+    )
+    compare_parser.add_argument(
+        '--rate-per-sec',
+        type=float,
+        default=float(os.getenv('EVAL_RATE_PER_SEC', '5.0')),
+        help='Maximum agent calls per second across both runs, 0 to disable; each run gets half (default: 5.0, env: EVAL_RATE_PER_SEC)'
+    )
     
     # Benchmark command
     bench_parser = subparsers.add_parser(
@@ -22,6 +22,12 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Set
 from collections import defaultdict, Counter
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from langsmith import Client
 from langsmith.evaluation import aevaluate, run_evaluator
@@ -31,6 +37,7 @@ from langsmith.schemas import Example, Run
 from log_analyzer_agent.graph import graph
 from log_analyzer_agent.state import CoreWorkingState, working_to_output, create_working_state
 from log_analyzer_agent.configuration import Configuration, ModelConfig
+from log_analyzer_agent.model_pool import cleanup_model_pool, get_model_pool
 
 # The "improved" implementation has been merged into the main implementation
 # No need for separate imports or switching logic
@@ -44,6 +51,20 @@ def normalize_text(text: str) -> str:
     return ' '.join(str(text).lower().split())
 
 
+def write_json(path: Path, data: Any) -> None:
+    """Write data as indented JSON, using orjson when it is installed.
+    
+    The document is serialized to bytes up front and written in one call.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+
 def calculate_text_similarity(text1: str, text2: str) -> float:
     """Calculate similarity between two texts using SequenceMatcher."""
     return SequenceMatcher(None, normalize_text(text1), normalize_text(text2)).ratio()
@@ -100,22 +121,48 @@ ISSUE_TYPE_GROUPS = {
     }
 }
 
+# ISSUE_TYPE_GROUPS inverted for matching: lowercased alias -> group, and
+# keyword -> every group listing it, so each distinct keyword is tested once
+ISSUE_ALIAS_TO_GROUP = {
+    alias.lower(): group_name
+    for group_name, group_info in ISSUE_TYPE_GROUPS.items()
+    for alias in group_info["aliases"]
+}
+ISSUE_KEYWORD_TO_GROUPS = {
+    keyword: tuple(
+        group_name for group_name, group_info in ISSUE_TYPE_GROUPS.items()
+        if keyword in group_info["keywords"]
+    )
+    for group_info in ISSUE_TYPE_GROUPS.values()
+    for keyword in group_info["keywords"]
+}
+
 
+@lru_cache(maxsize=4096)
 def match_issue_type(issue_type: str, issue_description: str = "") -> str:
-    """Match an issue type to a semantic group."""
+    """Match an issue type to a semantic group.
+    
+    Results are memoized: the same issues are matched by several evaluators
+    for every example, and repeatedly inside their pairwise matching loops.
+    """
     combined_text = f"{issue_type} {issue_description}".lower()
     
     # First check for exact alias matches
-    for group_name, group_info in ISSUE_TYPE_GROUPS.items():
-        if issue_type.lower() in [alias.lower() for alias in group_info["aliases"]]:
-            return group_name
+    alias_group = ISSUE_ALIAS_TO_GROUP.get(issue_type.lower())
+    if alias_group is not None:
+        return alias_group
+    
+    # Then check for keyword matches, crediting every group that lists a found keyword
+    scores = Counter()
+    for keyword, group_names in ISSUE_KEYWORD_TO_GROUPS.items():
+        if keyword in combined_text:
+            scores.update(group_names)
     
-    # Then check for keyword matches
     best_match = "general"
     best_score = 0
     
-    for group_name, group_info in ISSUE_TYPE_GROUPS.items():
-        score = sum(1 for keyword in group_info["keywords"] if keyword in combined_text)
+    for group_name in ISSUE_TYPE_GROUPS:
+        score = scores[group_name]
         if score > best_score:
             best_score = score
             best_match = group_name
@@ -123,6 +170,100 @@ def match_issue_type(issue_type: str, issue_description: str = "") -> str:
     return best_match
 
 
+def issue_groups(issues: List[Dict[str, Any]]) -> List[str]:
+    """Get the semantic group of each issue from its type and description."""
+    return [match_issue_type(issue.get("type", ""), issue.get("description", "")) for issue in issues]
+
+
+# ==================== Severity Levels ====================
+
+# Severity levels used for scoring
+SEVERITY_LEVELS = {
+    "critical": 4,
+    "high": 4,      # Some systems use "high" instead of "critical"
+    "error": 3,
+    "medium": 3,    # Some systems use "medium" instead of "error"
+    "warning": 2,
+    "low": 2,       # Some systems use "low" instead of "warning"
+    "info": 1
+}
+
+
+# Normalized form of the common severity labels, looked up before falling back to substring checks
+SEVERITY_ALIASES = {
+    "critical": "critical",
+    "fatal": "critical",
+    "error": "error",
+    "high": "error",
+    "warning": "warning",
+    "warn": "warning",
+    "medium": "warning",
+    "low": "info",
+    "info": "info",
+    "debug": "info"
+}
+
+
+def normalize_severity(sev: str) -> str:
+    """Normalize a severity label to one of critical, error, warning or info."""
+    sev_lower = str(sev).lower()
+    normalized = SEVERITY_ALIASES.get(sev_lower)
+    if normalized is not None:
+        return normalized
+    
+    if "critical" in sev_lower or "fatal" in sev_lower:
+        return "critical"
+    elif "error" in sev_lower or "high" in sev_lower:
+        return "error"
+    elif "warning" in sev_lower or "warn" in sev_lower or "medium" in sev_lower:
+        return "warning"
+    else:
+        return "info"
+
+
+# ==================== Evaluator Vocabularies ====================
+
+# Severities that make documentation and diagnostic commands expected
+CRITICAL_SEVERITIES = frozenset({"critical", "error"})
+
+# Fields every response should contain, in reporting order
+REQUIRED_FIELDS = ("issues", "explanations", "suggestions", "documentation_references", "diagnostic_commands")
+
+# Terms indicating a technically grounded explanation
+TECHNICAL_TERMS = frozenset({"system", "error", "service", "connection", "memory", "disk",
+                             "authentication", "configuration", "network", "process"})
+
+# Verbs indicating an actionable suggestion
+ACTION_VERBS = frozenset({"check", "verify", "ensure", "review", "monitor", "increase", "restart",
+                          "configure", "update", "fix", "repair", "investigate", "analyze", "test"})
+
+# Terms indicating a specific rather than generic suggestion
+SPECIFIC_TERMS = frozenset({"service", "network", "configuration", "log", "system", "memory",
+                            "disk", "port", "firewall", "authentication", "database", "file"})
+
+# Common diagnostic tools by area
+DIAGNOSTIC_KEYWORDS = {
+    "system": ["ps", "top", "uptime", "systemctl", "service", "dmesg"],
+    "network": ["netstat", "ss", "ping", "traceroute", "nslookup", "tcpdump", "ifconfig", "ip"],
+    "disk": ["df", "du", "iostat", "fdisk", "mount", "lsblk"],
+    "memory": ["free", "vmstat", "pmap", "smem"],
+    "logs": ["tail", "grep", "journalctl", "cat", "less", "awk"],
+    "process": ["ps", "pgrep", "lsof", "strace"],
+    "performance": ["iotop", "htop", "sar", "mpstat"]
+}
+
+# Compiled substring matchers for the diagnostic tools: one alternation over all
+# tools, and one per area, so each command text is searched in a single pass
+ALL_DIAGNOSTIC_RE = re.compile("|".join(
+    re.escape(keyword)
+    for keyword in sorted({keyword for keywords in DIAGNOSTIC_KEYWORDS.values() for keyword in keywords})
+))
+DIAGNOSTIC_AREA_RES = {
+    area: re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    for area, keywords in DIAGNOSTIC_KEYWORDS.items()
+}
+
+
 # ==================== Core Evaluators ====================
 
 @run_evaluator
@@ -162,29 +303,19 @@ def evaluate_issue_detection_comprehensive(run: Run, example: Example) -> Dict[s
                 "comment": f"Failed to detect any of the {len(expected_issues)} expected issues"
             }
         
-        # Match issues by semantic type
+        # Match issues by semantic type: each expected issue takes the first
+        # still-unmatched actual issue of its type
+        unmatched_actual_by_type = defaultdict(list)
+        for act_issue, act_type in zip(actual_issues, issue_groups(actual_issues)):
+            unmatched_actual_by_type[act_type].append(act_issue)
+        
         matched_issues = []
-        unmatched_expected = list(expected_issues)
-        unmatched_actual = list(actual_issues)
-        
-        # First pass: match by semantic type
-        for exp_issue in expected_issues[:]:
-            exp_type = match_issue_type(
-                exp_issue.get("type", ""), 
-                exp_issue.get("description", "")
-            )
-            
-            for act_issue in unmatched_actual[:]:
-                act_type = match_issue_type(
-                    act_issue.get("type", ""), 
-                    act_issue.get("description", "")
-                )
-                
-                if exp_type == act_type:
-                    matched_issues.append((exp_issue, act_issue))
-                    unmatched_expected.remove(exp_issue)
-                    unmatched_actual.remove(act_issue)
-                    break
+        for exp_issue, exp_type in zip(expected_issues, issue_groups(expected_issues)):
+            candidates = unmatched_actual_by_type.get(exp_type)
+            if candidates:
+                matched_issues.append((exp_issue, candidates.pop(0)))
+        
+        unmatched_actual_count = len(actual_issues) - len(matched_issues)
         
         # Calculate scores
         type_match_score = len(matched_issues) / len(expected_issues) if expected_issues else 0
@@ -209,7 +340,7 @@ def evaluate_issue_detection_comprehensive(run: Run, example: Example) -> Dict[s
         desc_quality_score = sum(description_scores) / len(description_scores) if description_scores else 0
         
         # Penalize false positives
-        false_positive_penalty = len(unmatched_actual) * 0.1
+        false_positive_penalty = unmatched_actual_count * 0.1
         
         # Combined score
         final_score = (
@@ -222,8 +353,8 @@ def evaluate_issue_detection_comprehensive(run: Run, example: Example) -> Dict[s
             f"Detected {len(matched_issues)}/{len(expected_issues)} expected issues",
             f"Description quality: {desc_quality_score:.2%}",
         ]
-        if unmatched_actual:
-            comment_parts.append(f"{len(unmatched_actual)} unexpected issues")
+        if unmatched_actual_count:
+            comment_parts.append(f"{unmatched_actual_count} unexpected issues")
         
         return {
             "key": "issue_detection_comprehensive",
@@ -258,50 +389,27 @@ def evaluate_severity_assessment(run: Run, example: Example) -> Dict[str, Any]:
                 "comment": "No issues to assess severity"
             }
         
-        # Define severity levels and scoring
-        severity_levels = {
-            "critical": 4,
-            "high": 4,      # Some systems use "high" instead of "critical"
-            "error": 3,
-            "medium": 3,    # Some systems use "medium" instead of "error"
-            "warning": 2,
-            "low": 2,       # Some systems use "low" instead of "warning"
-            "info": 1
-        }
-        
-        # Normalize severities
-        def normalize_severity(sev: str) -> str:
-            sev_lower = str(sev).lower()
-            if "critical" in sev_lower or "fatal" in sev_lower:
-                return "critical"
-            elif "error" in sev_lower or "high" in sev_lower:
-                return "error"
-            elif "warning" in sev_lower or "warn" in sev_lower or "medium" in sev_lower:
-                return "warning"
-            else:
-                return "info"
+        # Index the first actual issue of each semantic type, so every expected
+        # issue finds its match with one lookup instead of rescanning the list
+        first_actual_by_type = {}
+        for act_issue, act_type in zip(actual_issues, issue_groups(actual_issues)):
+            first_actual_by_type.setdefault(act_type, act_issue)
         
         # Match issues by type first
         severity_scores = []
         
-        for exp_issue in expected_issues:
-            exp_type = match_issue_type(exp_issue.get("type", ""), exp_issue.get("description", ""))
+        for exp_issue, exp_type in zip(expected_issues, issue_groups(expected_issues)):
             exp_severity = normalize_severity(exp_issue.get("severity", "info"))
             
             # Find matching actual issue
-            best_match = None
-            for act_issue in actual_issues:
-                act_type = match_issue_type(act_issue.get("type", ""), act_issue.get("description", ""))
-                if exp_type == act_type:
-                    best_match = act_issue
-                    break
+            best_match = first_actual_by_type.get(exp_type)
             
             if best_match:
                 act_severity = normalize_severity(best_match.get("severity", "info"))
                 
                 # Calculate severity score
-                exp_level = severity_levels.get(exp_severity, 1)
-                act_level = severity_levels.get(act_severity, 1)
+                exp_level = SEVERITY_LEVELS.get(exp_severity, 1)
+                act_level = SEVERITY_LEVELS.get(act_severity, 1)
                 
                 if exp_level == act_level:
                     severity_scores.append(1.0)
@@ -395,9 +503,8 @@ def evaluate_explanations_quality(run: Run, example: Example) -> Dict[str, Any]:
                     quality_scores.append(("concepts", concept_overlap))
                 
                 # Check for technical accuracy indicators
-                technical_terms = {"system", "error", "service", "connection", "memory", "disk", 
-                                 "authentication", "configuration", "network", "process"}
-                has_technical = any(term in act_explanation.lower() for term in technical_terms)
+                act_explanation_lower = act_explanation.lower()
+                has_technical = any(term in act_explanation_lower for term in TECHNICAL_TERMS)
                 quality_scores.append(("technical", 1.0 if has_technical else 0.5))
         
         # Calculate final score
@@ -472,24 +579,20 @@ def evaluate_suggestions_relevance(run: Run, example: Example) -> Dict[str, Any]
         quality_metrics.append(("coverage", coverage_ratio))
         
         # 2. Actionability - do suggestions contain action verbs?
-        action_verbs = {"check", "verify", "ensure", "review", "monitor", "increase", "restart", 
-                       "configure", "update", "fix", "repair", "investigate", "analyze", "test"}
+        suggestions_lower = [suggestion.lower() for suggestion in actual_suggestions]
         
         actionable_count = 0
-        for suggestion in actual_suggestions:
-            if any(verb in suggestion.lower() for verb in action_verbs):
+        for suggestion_lower in suggestions_lower:
+            if any(verb in suggestion_lower for verb in ACTION_VERBS):
                 actionable_count += 1
         
         actionability_score = actionable_count / len(actual_suggestions) if actual_suggestions else 0
         quality_metrics.append(("actionability", actionability_score))
         
         # 3. Specificity - are suggestions specific rather than generic?
-        specific_terms = {"service", "network", "configuration", "log", "system", "memory", 
-                         "disk", "port", "firewall", "authentication", "database", "file"}
-        
         specific_count = 0
-        for suggestion in actual_suggestions:
-            if any(term in suggestion.lower() for term in specific_terms):
+        for suggestion_lower in suggestions_lower:
+            if any(term in suggestion_lower for term in SPECIFIC_TERMS):
                 specific_count += 1
         
         specificity_score = specific_count / len(actual_suggestions) if actual_suggestions else 0
@@ -497,8 +600,7 @@ def evaluate_suggestions_relevance(run: Run, example: Example) -> Dict[str, Any]
         
         # 4. Relevance to issues - do suggestions address the identified issues?
         if actual_issues:
-            issue_types = [match_issue_type(issue.get("type", ""), issue.get("description", "")) 
-                          for issue in actual_issues]
+            issue_types = issue_groups(actual_issues)
             
             relevant_count = 0
             for suggestion in actual_suggestions:
@@ -566,7 +668,7 @@ def evaluate_documentation_references(run: Run, example: Example) -> Dict[str, A
         
         if not actual_docs:
             # Check if documentation is critical (for errors/critical issues)
-            has_critical = any(issue.get("severity") in ["critical", "error"] for issue in actual_issues)
+            has_critical = any(issue.get("severity") in CRITICAL_SEVERITIES for issue in actual_issues)
             score = 0.0 if has_critical else 0.3  # More forgiving if no critical issues
             return {
                 "key": "documentation_references",
@@ -605,8 +707,7 @@ def evaluate_documentation_references(run: Run, example: Example) -> Dict[str, A
         # Check relevance to issues
         if actual_issues:
             issue_keywords = set()
-            for issue in actual_issues:
-                issue_type = match_issue_type(issue.get("type", ""), issue.get("description", ""))
+            for issue_type in issue_groups(actual_issues):
                 issue_keywords.update(ISSUE_TYPE_GROUPS.get(issue_type, {}).get("keywords", []))
             
             relevance_scores = []
@@ -699,25 +800,10 @@ def evaluate_diagnostic_commands_quality(run: Run, example: Example) -> Dict[str
                 quality_metrics.append(("structure", 0.6))
         
         # 2. Command relevance to common diagnostic tools
-        diagnostic_keywords = {
-            "system": ["ps", "top", "uptime", "systemctl", "service", "dmesg"],
-            "network": ["netstat", "ss", "ping", "traceroute", "nslookup", "tcpdump", "ifconfig", "ip"],
-            "disk": ["df", "du", "iostat", "fdisk", "mount", "lsblk"],
-            "memory": ["free", "vmstat", "pmap", "smem"],
-            "logs": ["tail", "grep", "journalctl", "cat", "less", "awk"],
-            "process": ["ps", "pgrep", "lsof", "strace"],
-            "performance": ["iotop", "htop", "sar", "mpstat"]
-        }
-        
-        # Flatten all keywords
-        all_diagnostic_keywords = set()
-        for keywords in diagnostic_keywords.values():
-            all_diagnostic_keywords.update(keywords)
-        
         relevant_commands = 0
         for cmd in valid_commands:
             command_text = cmd.get("command", "").lower()
-            if any(keyword in command_text for keyword in all_diagnostic_keywords):
+            if ALL_DIAGNOSTIC_RE.search(command_text):
                 relevant_commands += 1
         
         relevance_score = relevant_commands / len(valid_commands) if valid_commands else 0
@@ -729,8 +815,7 @@ def evaluate_diagnostic_commands_quality(run: Run, example: Example) -> Dict[str
         
         # 4. Appropriateness to issues
         if actual_issues:
-            issue_types = [match_issue_type(issue.get("type", ""), issue.get("description", "")) 
-                          for issue in actual_issues]
+            issue_types = issue_groups(actual_issues)
             
             appropriate_commands = 0
             for cmd in valid_commands:
@@ -740,8 +825,8 @@ def evaluate_diagnostic_commands_quality(run: Run, example: Example) -> Dict[str
                 
                 # Check if command is appropriate for any issue type
                 for issue_type in issue_types:
-                    if issue_type in diagnostic_keywords:
-                        if any(keyword in command_text for keyword in diagnostic_keywords[issue_type]):
+                    if issue_type in DIAGNOSTIC_AREA_RES:
+                        if DIAGNOSTIC_AREA_RES[issue_type].search(command_text):
                             appropriate_commands += 1
                             break
             
@@ -788,11 +873,9 @@ def evaluate_overall_completeness(run: Run, example: Example) -> Dict[str, Any]:
         actual = run.outputs or {}
         expected = example.outputs or {}
         
-        required_fields = ["issues", "explanations", "suggestions", "documentation_references", "diagnostic_commands"]
-        
         # Check field presence
-        present_fields = [field for field in required_fields if field in actual]
-        completeness_score = len(present_fields) / len(required_fields)
+        present_fields = [field for field in REQUIRED_FIELDS if field in actual]
+        completeness_score = len(present_fields) / len(REQUIRED_FIELDS)
         
         # Check field population (not just present but has content)
         populated_fields = []
@@ -805,7 +888,7 @@ def evaluate_overall_completeness(run: Run, example: Example) -> Dict[str, Any]:
             elif isinstance(value, str) and value.strip():
                 populated_fields.append(field)
         
-        population_score = len(populated_fields) / len(required_fields)
+        population_score = len(populated_fields) / len(REQUIRED_FIELDS)
         
         # Check consistency between fields
         consistency_score = 1.0
@@ -819,7 +902,7 @@ def evaluate_overall_completeness(run: Run, example: Example) -> Dict[str, Any]:
                 consistency_score -= 0.2
             
             # For critical issues, we expect documentation and commands
-            has_critical = any(issue.get("severity") in ["critical", "error"] for issue in issues)
+            has_critical = any(issue.get("severity") in CRITICAL_SEVERITIES for issue in issues)
             if has_critical:
                 if not actual.get("documentation_references"):
                     consistency_score -= 0.1
@@ -842,7 +925,7 @@ def evaluate_overall_completeness(run: Run, example: Example) -> Dict[str, Any]:
         )
         
         # Generate feedback
-        missing_fields = [f for f in required_fields if f not in present_fields]
+        missing_fields = [f for f in REQUIRED_FIELDS if f not in actual]
         unpopulated_fields = [f for f in present_fields if f not in populated_fields]
         
         feedback_parts = []
@@ -870,10 +953,64 @@ def evaluate_overall_completeness(run: Run, example: Example) -> Dict[str, Any]:
         }
 
 
+# Per-example evaluators, all scored by evaluate_all_metrics
+EXAMPLE_EVALUATORS = [
+    evaluate_issue_detection_comprehensive,
+    evaluate_severity_assessment,
+    evaluate_explanations_quality,
+    evaluate_suggestions_relevance,
+    evaluate_documentation_references,
+    evaluate_diagnostic_commands_quality,
+    evaluate_overall_completeness,
+]
+
+
+# Results of the issue-based evaluators when neither the run nor the example has issues
+NO_ISSUES_RESULTS = {
+    evaluate_issue_detection_comprehensive: {
+        "key": "issue_detection_comprehensive",
+        "score": 1.0,
+        "comment": "Correctly identified no issues present"
+    },
+    evaluate_severity_assessment: {
+        "key": "severity_assessment",
+        "score": 1.0,
+        "comment": "No issues to assess severity"
+    },
+}
+
+
+async def _run_example_evaluator(evaluator, run: Run, example: Example, no_issues: bool) -> Dict[str, Any]:
+    """Run one evaluator's function without blocking the event loop."""
+    if no_issues and evaluator in NO_ISSUES_RESULTS:
+        return dict(NO_ISSUES_RESULTS[evaluator])
+    if evaluator.is_async:
+        return await evaluator.func(run, example)
+    return await asyncio.to_thread(evaluator.func, run, example)
+
+
+@run_evaluator
+async def evaluate_all_metrics(run: Run, example: Example) -> Dict[str, Any]:
+    """
+    Run every per-example evaluator concurrently for one run.
+    Each evaluator's result is still reported as its own feedback key.
+    Issue-based evaluators are answered directly when there are no issues on either side.
+    """
+    no_issues = not (run.outputs or {}).get("issues") and not (example.outputs or {}).get("issues")
+    results = await asyncio.gather(*(
+        _run_example_evaluator(evaluator, run, example, no_issues) for evaluator in EXAMPLE_EVALUATORS
+    ))
+    return {"results": list(results)}
+
+
 # ==================== Summary Evaluators ====================
 
-def precision_recall_f1_summary(runs: List[Run], examples: List[Example]) -> Dict[str, Any]:
-    """Calculate precision, recall, and F1 score for issue detection across all examples."""
+def _compute_confusion(runs: List[Run], examples: List[Example]) -> Tuple[int, int, int]:
+    """Count issue-type true positives, false positives and false negatives over all runs.
+    
+    Each run/example pair is read and type-matched exactly once, so every
+    detection metric can be derived from the returned totals.
+    """
     total_tp, total_fp, total_fn = 0, 0, 0
     
     for run, example in zip(runs, examples):
@@ -887,27 +1024,30 @@ def precision_recall_f1_summary(runs: List[Run], examples: List[Example]) -> Dic
         expected_issues = expected.get("issues", [])
         
         # Match issues by semantic type
-        actual_types = Counter(
-            match_issue_type(issue.get("type", ""), issue.get("description", ""))
-            for issue in actual_issues
-        )
-        expected_types = Counter(
-            match_issue_type(issue.get("type", ""), issue.get("description", ""))
-            for issue in expected_issues
-        )
+        actual_types = Counter(issue_groups(actual_issues))
+        expected_types = Counter(issue_groups(expected_issues))
         
-        # Calculate true positives, false positives, and false negatives
-        for issue_type in set(actual_types.keys()) | set(expected_types.keys()):
+        # Calculate true positives and false negatives from the expected types,
+        # then false positives from the actual ones, without building a key union
+        for issue_type, expected_count in expected_types.items():
             actual_count = actual_types.get(issue_type, 0)
+            if actual_count < expected_count:
+                total_tp += actual_count
+                total_fn += expected_count - actual_count
+            else:
+                total_tp += expected_count
+        
+        for issue_type, actual_count in actual_types.items():
             expected_count = expected_types.get(issue_type, 0)
-            
-            tp = min(actual_count, expected_count)
-            fp = max(0, actual_count - expected_count)
-            fn = max(0, expected_count - actual_count)
-            
-            total_tp += tp
-            total_fp += fp
-            total_fn += fn
+            if actual_count > expected_count:
+                total_fp += actual_count - expected_count
+    
+    return total_tp, total_fp, total_fn
+
+
+def precision_recall_f1_summary(runs: List[Run], examples: List[Example]) -> Dict[str, Any]:
+    """Calculate precision, recall, and F1 score for issue detection across all examples."""
+    total_tp, total_fp, total_fn = _compute_confusion(runs, examples)
     
     precision = total_tp / (total_tp + total_fp) if (total_tp + total_fp) > 0 else 0
     recall = total_tp / (total_tp + total_fn) if (total_tp + total_fn) > 0 else 0
@@ -974,6 +1114,44 @@ def response_quality_summary(runs: List[Run], examples: List[Example]) -> Dict[s
 
 # ==================== Agent Runner ====================
 
+# Default number of examples run at once and agent calls started per second;
+# both can be overridden from the environment or the command line
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("EVAL_MAX_CONCURRENCY", "32"))
+DEFAULT_RATE_PER_SEC = float(os.getenv("EVAL_RATE_PER_SEC", "5.0"))
+
+
+class AsyncRateLimiter:
+    """Token bucket limiting how many agent calls start per second.
+    
+    Up to ``rate_per_sec`` calls may start back to back; after that each
+    caller waits for its token, so bursts are throttled while calls that
+    have started keep running concurrently. A non-positive rate disables it.
+    """
+    
+    def __init__(self, rate_per_sec: float):
+        self.rate = rate_per_sec
+        self.capacity = max(1.0, rate_per_sec)
+        self._tokens = self.capacity
+        self._updated_at: Optional[float] = None
+    
+    async def acquire(self) -> None:
+        """Wait until another call may start."""
+        if self.rate <= 0:
+            return
+        
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._updated_at is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        
+        # Take a token now, possibly going into debt, and sleep until it is earned;
+        # later callers queue behind the debt instead of all waking at once
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
 def transform_output_fields(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
     """Transform agent output fields to match expected evaluation format.
     
@@ -1005,11 +1183,39 @@ def transform_output_fields(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
     return transformed
 
 
-async def run_agent_on_input(inputs: Dict[str, Any], config: Optional[Configuration] = None) -> Dict[str, Any]:
+def extract_analysis_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the agent's analysis from its final state.
+    
+    Uses ``analysis_result`` when set, otherwise the arguments of the most
+    recent non-empty submit_analysis tool call. Returns an empty dict when
+    neither yields a dict.
+    """
+    analysis_result = result.get("analysis_result")
+    if analysis_result:
+        return analysis_result if isinstance(analysis_result, dict) else {}
+    
+    # Look for the last submit_analysis tool call in messages
+    for message in reversed(result.get("messages", [])):
+        for tool_call in getattr(message, "tool_calls", None) or ():
+            if tool_call.get("name") == "submit_analysis":
+                args = tool_call.get("args", {})
+                if args:
+                    return args if isinstance(args, dict) else {}
+                break
+    
+    return {}
+
+
+async def run_agent_on_input(
+    inputs: Dict[str, Any],
+    config: Optional[Configuration] = None,
+    rate_limiter: Optional[AsyncRateLimiter] = None,
+) -> Dict[str, Any]:
     """Run the log analyzer agent on a single input with robust error handling."""
     try:
         # Rate limiting
-        await asyncio.sleep(1)
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
         
         # Initialize state using the proper state structure
         initial_state = {
@@ -1041,24 +1247,7 @@ async def run_agent_on_input(inputs: Dict[str, Any], config: Optional[Configurat
         result = await graph.ainvoke(initial_state, config=runnable_config)
         
         # Extract analysis result - handle both old and new formats
-        analysis_result = result.get("analysis_result", {})
-        
-        # If analysis_result is None or empty, try to extract from final analysis
-        if not analysis_result:
-            # Look for the last submit_analysis tool call in messages
-            messages = result.get("messages", [])
-            for message in reversed(messages):
-                if hasattr(message, "tool_calls") and message.tool_calls:
-                    for tool_call in message.tool_calls:
-                        if tool_call.get("name") == "submit_analysis":
-                            analysis_result = tool_call.get("args", {})
-                            break
-                if analysis_result:
-                    break
-        
-        # Ensure we have the expected structure
-        if not isinstance(analysis_result, dict):
-            analysis_result = {}
+        analysis_result = extract_analysis_result(result)
         
         # Transform output fields to match expected format
         analysis_result = transform_output_fields(analysis_result)
@@ -1085,12 +1274,36 @@ async def run_agent_on_input(inputs: Dict[str, Any], config: Optional[Configurat
 
 # ==================== Main Evaluation Function ====================
 
+def normalize_result(result: Any) -> Tuple[bool, List[Tuple[str, float]]]:
+    """Reduce one experiment result to whether it failed and its (key, score) pairs.
+    
+    aevaluate yields dict rows holding the run and its evaluation results;
+    objects exposing ``error`` and ``feedback`` attributes are accepted too.
+    Feedback without a score is skipped.
+    """
+    if isinstance(result, dict):
+        if getattr(result.get("run"), "error", None):
+            return True, []
+        feedback = (result.get("evaluation_results") or {}).get("results", [])
+    else:
+        if getattr(result, "error", None):
+            return True, []
+        feedback = getattr(result, "feedback", None) or []
+    
+    return False, [
+        (item.key, item.score) for item in feedback
+        if hasattr(item, "key") and getattr(item, "score", None) is not None
+    ]
+
+
 async def run_evaluation(
     dataset_name: str = "log-analyzer-evaluation",
     max_examples: Optional[int] = None,
     experiment_prefix: Optional[str] = None,
     primary_model: Optional[str] = None,
     orchestration_model: Optional[str] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    rate_per_sec: float = DEFAULT_RATE_PER_SEC,
 ):
     """Run the comprehensive evaluation on the LangSmith dataset."""
     
@@ -1130,17 +1343,10 @@ async def run_evaluation(
     print(f"Orchestration model: {config.orchestration_model.get_model_string()}")
     if max_examples:
         print(f"Limiting to {max_examples} examples")
+    print(f"Concurrency: {max_concurrency} examples, {rate_per_sec:g} agent calls/sec")
     
-    # Define evaluators
-    evaluators = [
-        evaluate_issue_detection_comprehensive,
-        evaluate_severity_assessment,
-        evaluate_explanations_quality,
-        evaluate_suggestions_relevance,
-        evaluate_documentation_references,
-        evaluate_diagnostic_commands_quality,
-        evaluate_overall_completeness,
-    ]
+    # Define evaluators; the per-example metrics are gathered by one composite evaluator
+    evaluators = [evaluate_all_metrics]
     
     # Define summary evaluators
     summary_evaluators = [
@@ -1159,64 +1365,85 @@ async def run_evaluation(
     print("\nRunning evaluation...")
     print(f"Experiment: {experiment_prefix}")
     
-    # Create a wrapper function that includes the config
-    async def run_agent_wrapper(inputs: Dict[str, Any]) -> Dict[str, Any]:
-        return await run_agent_on_input(inputs, config)
+    # Let the agent's model pool keep one model per in-flight example, so every
+    # example reuses a warm model and its HTTP connections instead of the
+    # instances beyond the pool's default size being created and dropped per call
+    model_pool = await get_model_pool()
+    model_pool.max_instances_per_model = max(model_pool.max_instances_per_model, max_concurrency)
     
-    # Run evaluation
-    results = await aevaluate(
-        run_agent_wrapper,
-        data=dataset_name,
-        evaluators=evaluators,
-        summary_evaluators=summary_evaluators,
-        experiment_prefix=experiment_prefix,
-        max_concurrency=2,
-        metadata={
-            "evaluation_version": "consolidated_v1",
-            "timestamp": timestamp,
-            "evaluator_count": len(evaluators),
-            "implementation": "main",
-            "primary_model": config.primary_model.get_model_string(),
-            "orchestration_model": config.orchestration_model.get_model_string(),
-        },
-    )
-    
-    # Process results
-    print("\n" + "="*80)
-    print("EVALUATION RESULTS")
-    print("="*80)
-    
-    results_list = [res async for res in results]
-    total_examples = len(results_list)
-    errors = sum(1 for res in results_list if (hasattr(res, 'error') and res.error))
+    # The pool's background cleanup task is stopped however the run ends
+    try:
+        # Create a wrapper function that includes the config and shared rate limiter
+        rate_limiter = AsyncRateLimiter(rate_per_sec)
+        
+        async def run_agent_wrapper(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            return await run_agent_on_input(inputs, config, rate_limiter)
+        
+        # Run evaluation
+        results = await aevaluate(
+            run_agent_wrapper,
+            data=dataset_name,
+            evaluators=evaluators,
+            summary_evaluators=summary_evaluators,
+            experiment_prefix=experiment_prefix,
+            max_concurrency=max_concurrency,
+            metadata={
+                "evaluation_version": "consolidated_v1",
+                "timestamp": timestamp,
+                "evaluator_count": len(EXAMPLE_EVALUATORS),
+                "implementation": "main",
+                "primary_model": config.primary_model.get_model_string(),
+                "orchestration_model": config.orchestration_model.get_model_string(),
+                "max_concurrency": max_concurrency,
+                "rate_per_sec": rate_per_sec,
+            },
+        )
+        
+        # Process results
+        print("\n" + "="*80)
+        print("EVALUATION RESULTS")
+        print("="*80)
+        
+        # Collect individual metrics as results stream in, rather than holding every result;
+        # each metric keeps a running sum, count, min and max instead of all of its scores
+        total_examples = 0
+        errors = 0
+        metric_sums = Counter()
+        metric_counts = Counter()
+        metric_mins: Dict[str, float] = {}
+        metric_maxs: Dict[str, float] = {}
+        async for result in results:
+            total_examples += 1
+            failed, scores = normalize_result(result)
+            if failed:
+                errors += 1
+                continue
+            
+            for key, score in scores:
+                metric_sums[key] += score
+                metric_counts[key] += 1
+                if key not in metric_mins or score < metric_mins[key]:
+                    metric_mins[key] = score
+                if key not in metric_maxs or score > metric_maxs[key]:
+                    metric_maxs[key] = score
+    finally:
+        await cleanup_model_pool()
     
     print(f"\nTotal examples evaluated: {total_examples}")
     print(f"Errors encountered: {errors}")
     print(f"Success rate: {((total_examples - errors) / total_examples * 100):.1f}%")
     
-    # Collect individual metrics
-    metrics = defaultdict(list)
-    for result in results_list:
-        if hasattr(result, 'error') and result.error:
-            continue
-        
-        if hasattr(result, 'feedback'):
-            for feedback in result.feedback:
-                if hasattr(feedback, 'key') and hasattr(feedback, 'score'):
-                    metrics[feedback.key].append(feedback.score)
-    
     # Display individual metrics
     print("\nIndividual Metric Scores:")
     print("-" * 60)
-    for metric_name, scores in sorted(metrics.items()):
-        if scores:
-            avg_score = sum(scores) / len(scores)
-            min_score = min(scores)
-            max_score = max(scores)
-            print(f"{metric_name:.<40} {avg_score:.2%} (min: {min_score:.2%}, max: {max_score:.2%})")
+    for metric_name in sorted(metric_counts):
+        avg_score = metric_sums[metric_name] / metric_counts[metric_name]
+        min_score = metric_mins[metric_name]
+        max_score = metric_maxs[metric_name]
+        print(f"{metric_name:.<40} {avg_score:.2%} (min: {min_score:.2%}, max: {max_score:.2%})")
     
-    # Save results
-    results_file = Path(f"evaluation_results_consolidated_{timestamp}.json")
+    # Save results; the experiment prefix keeps runs started in the same second apart
+    results_file = Path(f"evaluation_results_consolidated_{experiment_prefix}_{timestamp}.json")
     detailed_results = {
         "dataset": dataset_name,
         "experiment_prefix": experiment_prefix,
@@ -1226,17 +1453,16 @@ async def run_evaluation(
         "errors": errors,
         "metrics": {
             name: {
-                "average": sum(scores)/len(scores) if scores else 0,
-                "min": min(scores) if scores else 0,
-                "max": max(scores) if scores else 0,
-                "count": len(scores)
+                "average": metric_sums[name] / count,
+                "min": metric_mins[name],
+                "max": metric_maxs[name],
+                "count": count
             }
-            for name, scores in metrics.items()
+            for name, count in metric_counts.items()
         }
     }
     
-    with open(results_file, 'w') as f:
-        json.dump(detailed_results, f, indent=2)
+    write_json(results_file, detailed_results)
     
     print(f"\nDetailed results saved to: {results_file}")
     print(f"\nView full results in LangSmith: https://smith.langchain.com/")
@@ -1254,13 +1480,27 @@ if __name__ == "__main__":
     parser.add_argument("--experiment-prefix", help="Custom experiment prefix")
     parser.add_argument("--primary-model", help="Primary model in provider:model format (e.g., gemini:gemini-2.0-flash-exp)")
     parser.add_argument("--orchestration-model", help="Orchestration model in provider:model format (e.g., groq:deepseek-r1-distill-llama-70b)")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="Maximum number of examples evaluated at once (env: EVAL_MAX_CONCURRENCY)")
+    parser.add_argument("--rate-per-sec", type=float, default=DEFAULT_RATE_PER_SEC,
+                        help="Maximum agent calls started per second, 0 to disable (env: EVAL_RATE_PER_SEC)")
     
     args = parser.parse_args()
     
-    asyncio.run(run_evaluation(
+    evaluation = run_evaluation(
         dataset_name=args.dataset,
         max_examples=args.max_examples,
         experiment_prefix=args.experiment_prefix,
         primary_model=args.primary_model,
-        orchestration_model=args.orchestration_model
-    ))
\ No newline at end of file
+        orchestration_model=args.orchestration_model,
+        max_concurrency=args.max_concurrency,
+        rate_per_sec=args.rate_per_sec
+    )
+    
+    # Prefer uvloop's faster event loop for the concurrent fan-out when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(evaluation)
+    else:
+        uvloop.run(evaluation)
\ No newline at end of file
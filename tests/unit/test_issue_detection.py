@@ -0,0 +1,92 @@
+"""Unit tests for the issue detection evaluator."""
+
+import pytest
+
+from evaluation.evaluators import issue_detection
+from evaluation.evaluators.issue_detection import IssueDetectionEvaluator, _LOG_SCAN_CACHE_SIZE
+
+
+class TestLogContentAnalysis:
+    """Test the keyword scan of log content."""
+    
+    def test_keywords_found_as_substrings(self):
+        """Test that keywords are found inside longer words."""
+        evaluator = IssueDetectionEvaluator()
+        
+        potential_issues = evaluator._analyze_log_content("deadlock detected after https warning")
+        
+        assert potential_issues["warning"] == ["warning", "warn"]
+        assert potential_issues["database"] == ["deadlock", "lock"]
+        assert potential_issues["network"] == ["http", "https"]
+        assert "error" not in potential_issues
+    
+    def test_repeated_scan_returns_same_result(self):
+        """Test that a cached scan gives the same result as the first one."""
+        evaluator = IssueDetectionEvaluator()
+        log_lower = "connection timeout while running sql query"
+        
+        first = evaluator._analyze_log_content(log_lower)
+        first["network"].append("modified by caller")
+        second = evaluator._analyze_log_content(log_lower)
+        
+        assert second == evaluator._analyze_log_content(log_lower)
+        assert "modified by caller" not in second["network"]
+        assert len(evaluator._log_scan_cache) == 1
+    
+    def test_scan_cache_stays_small(self):
+        """Test that the scan cache is bounded and holds no log text."""
+        evaluator = IssueDetectionEvaluator()
+        logs = [f"error {i} " + "x" * 100_000 for i in range(3 * _LOG_SCAN_CACHE_SIZE)]
+        
+        for log_lower in logs:
+            evaluator._analyze_log_content(log_lower)
+        
+        assert len(evaluator._log_scan_cache) == _LOG_SCAN_CACHE_SIZE
+        assert all(len(key) == 64 for key in evaluator._log_scan_cache)
+        assert sum(len(str(value)) for value in evaluator._log_scan_cache.values()) < 10_000
+    
+    def test_scan_cache_keeps_recently_used_logs(self, monkeypatch):
+        """Test that a log read again is not evicted first."""
+        scans = []
+        scan_log_keywords = issue_detection._scan_log_keywords
+        
+        def counting_scan(log_lower, frozen_keywords):
+            scans.append(log_lower)
+            return scan_log_keywords(log_lower, frozen_keywords)
+        
+        monkeypatch.setattr(issue_detection, "_scan_log_keywords", counting_scan)
+        evaluator = IssueDetectionEvaluator()
+        
+        for i in range(1, _LOG_SCAN_CACHE_SIZE + 2):
+            evaluator._analyze_log_content("error 0")
+            evaluator._analyze_log_content(f"error {i}")
+        evaluator._analyze_log_content("error 0")
+        evaluator._analyze_log_content("error 1")
+        
+        assert scans.count("error 0") == 1
+        assert scans.count("error 1") == 2
+
+
+class TestHeuristicDetection:
+    """Test heuristic scoring when no reference issues are available."""
+    
+    @pytest.mark.parametrize("log_lower, expected", [
+        ("", 0.5),
+        ("all services started normally", 0.8),
+        ("disk error on node 7", 0.0),
+    ])
+    def test_no_detected_issues(self, log_lower, expected):
+        """Test the score when the system reported no issues."""
+        evaluator = IssueDetectionEvaluator()
+        
+        assert evaluator._heuristic_detection_evaluation([], log_lower) == expected
+    
+    def test_detected_issues_in_clean_log(self):
+        """Test that issues reported for a log without indicators are penalized."""
+        evaluator = IssueDetectionEvaluator()
+        
+        score = evaluator._heuristic_detection_evaluation(
+            [{"description": "Something looks odd"}], "all services started normally"
+        )
+        
+        assert score == 0.4
@@ -0,0 +1,325 @@
+"""Unit tests for the LogHub dataset provider."""
+
+import io
+import tarfile
+from pathlib import Path
+from typing import Dict
+
+import pytest
+import requests
+
+from evaluation.providers import loghub_provider
+from evaluation.providers.loghub_provider import LogHubProvider
+
+
+def write_archive(archive_path: Path, files: Dict[str, bytes]) -> Path:
+    """Write a tar.gz archive holding the given member names and contents."""
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(archive_path, "w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return archive_path
+
+
+@pytest.fixture
+def make_provider(tmp_path, monkeypatch):
+    """Create providers whose archives are placed in tmp_path instead of downloaded."""
+    # An unreachable server makes the provider trust an archive already on disk
+    monkeypatch.setattr(LogHubProvider, "_probe_archive", lambda self, url: (0, False))
+    
+    def _make(dataset_name: str, files: Dict[str, bytes]) -> LogHubProvider:
+        provider = LogHubProvider(
+            dataset_name,
+            data_dir=str(tmp_path / "data"),
+            cache_dir=str(tmp_path / "cache")
+        )
+        write_archive(provider.data_dir / provider.dataset_info["file_name"], files)
+        return provider
+    
+    return _make
+
+
+SSH_LINES = [
+    "Dec 10 06:55:46 LabSZ sshd[24200]: reverse mapping checking getaddrinfo failed",
+    "Dec 10 06:55:46 LabSZ sshd[24200]: Invalid user webmaster from 173.234.31.186",
+    "Dec 10 06:55:48 LabSZ sshd[24200]: Failed password for invalid user webmaster",
+]
+
+SSH_LOG = ("\n".join(SSH_LINES) + "\n").encode("utf-8")
+
+
+class TestArchiveExtraction:
+    """Test extraction of wrapped and flat dataset archives."""
+    
+    def test_wrapped_archive(self, make_provider):
+        """Test an archive with a single top-level directory."""
+        provider = make_provider("SSH", {"SSH/SSH.log": SSH_LOG})
+        
+        samples = provider.load_samples()
+        
+        extract_dir = provider._get_extract_dir()
+        assert (extract_dir / "SSH.log").is_file()
+        assert not (extract_dir / "SSH").exists()
+        assert [sample.content for sample in samples] == SSH_LINES
+    
+    def test_flat_archive(self, make_provider):
+        """Test an archive whose files sit at the top level."""
+        provider = make_provider("SSH", {"SSH.log": SSH_LOG, "README.md": b"SSH logs\n"})
+        
+        samples = provider.load_samples()
+        
+        extract_dir = provider._get_extract_dir()
+        assert (extract_dir / "SSH.log").is_file()
+        assert (extract_dir / "README.md").is_file()
+        assert [sample.content for sample in samples] == SSH_LINES
+    
+    def test_staging_directory_removed(self, make_provider):
+        """Test that no staging directory is left behind after extraction."""
+        provider = make_provider("SSH", {"SSH/SSH.log": SSH_LOG})
+        
+        provider.load_samples()
+        
+        assert sorted(path.name for path in provider.data_dir.iterdir()) == ["SSH.tar.gz", "SSH_extracted"]
+
+
+class TestStructuredData:
+    """Test loading of structured CSV data, templates and labels."""
+    
+    HDFS_LOG = (
+        "081109 203615 148 INFO dfs.DataNode$PacketResponder: PacketResponder 1 terminating\n"
+        "081109 203807 222 INFO dfs.DataNode$PacketResponder: PacketResponder 0 terminating\n"
+        "081109 204005 35 INFO dfs.FSNamesystem: BLOCK* NameSystem.addStoredBlock\n"
+    ).encode("utf-8")
+    
+    # A blank row, and a short row that lacks its EventId
+    HDFS_STRUCTURED = (
+        "LineId,Level,EventId\n"
+        "1,INFO,E1\n"
+        "\n"
+        "2,INFO\n"
+    ).encode("utf-8")
+    
+    HDFS_TEMPLATES = (
+        "EventId,EventTemplate\n"
+        "E1,PacketResponder <*> terminating\n"
+    ).encode("utf-8")
+    
+    ANOMALY_LABELS = (
+        "BlockId,Label\n"
+        "blk_1,Normal\n"
+        "blk_2,Anomaly\n"
+    ).encode("utf-8")
+    
+    def make_hdfs_provider(self, make_provider) -> LogHubProvider:
+        return make_provider("HDFS", {
+            "HDFS_1/HDFS.log": self.HDFS_LOG,
+            "HDFS_1/HDFS.log_structured.csv": self.HDFS_STRUCTURED,
+            "HDFS_1/HDFS.log_templates.csv": self.HDFS_TEMPLATES,
+            "HDFS_1/anomaly_label.csv": self.ANOMALY_LABELS,
+        })
+    
+    def test_structured_rows_added_to_entry_metadata(self, make_provider):
+        """Test that each entry takes the structured values of its row."""
+        provider = self.make_hdfs_provider(make_provider)
+        
+        samples = provider.load_samples()
+        
+        assert len(samples) == 3
+        assert samples[0].metadata["index"] == 0
+        assert samples[0].metadata["dataset"] == "HDFS"
+        assert samples[0].metadata["LineId"] == "1"
+        assert samples[0].metadata["EventId"] == "E1"
+    
+    def test_blank_and_short_csv_rows(self, make_provider):
+        """Test that blank rows are skipped and short rows padded with None."""
+        provider = self.make_hdfs_provider(make_provider)
+        
+        samples = provider.load_samples()
+        
+        assert samples[1].metadata["LineId"] == "2"
+        assert samples[1].metadata["Level"] == "INFO"
+        assert samples[1].metadata["EventId"] is None
+        # Past the last structured row, entries only carry the basic fields
+        assert "LineId" not in samples[2].metadata
+    
+    def test_templates_and_labels_in_metadata(self, make_provider):
+        """Test that templates and labels are loaded into the dataset metadata."""
+        provider = self.make_hdfs_provider(make_provider)
+        
+        metadata = provider.get_metadata()
+        
+        assert metadata["has_structured_data"] is True
+        assert metadata["has_templates"] is True
+        assert metadata["has_labels"] is True
+        assert metadata["structured_data"]["EventId"] == ["E1", None]
+        assert metadata["templates"] == {
+            "EventId": ["E1"],
+            "EventTemplate": ["PacketResponder <*> terminating"]
+        }
+        assert metadata["labels"]["anomaly_label.csv"]["Label"] == ["Normal", "Anomaly"]
+    
+    def test_header_only_csv(self, tmp_path):
+        """Test that a CSV file without rows gives empty columns."""
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_text("EventId,EventTemplate\n")
+        provider = LogHubProvider("HDFS", data_dir=str(tmp_path / "data"), cache_dir=str(tmp_path / "cache"))
+        
+        assert provider._read_csv_columns(csv_file) == {"EventId": [], "EventTemplate": []}
+    
+    def test_csv_columns(self, tmp_path):
+        """Test column values for blank, short, long and repeated-header rows."""
+        csv_file = tmp_path / "columns.csv"
+        csv_file.write_text("a,b,a\n1,2,3\n\n4\n5,6,7,8\n")
+        provider = LogHubProvider("HDFS", data_dir=str(tmp_path / "data"), cache_dir=str(tmp_path / "cache"))
+        
+        # A repeated header name keeps its last column; long rows are cut to the header
+        assert provider._read_csv_columns(csv_file) == {"a": ["3", None, "7"], "b": ["2", None, "6"]}
+
+
+class TestLogEncoding:
+    """Test reading of log files that are not valid UTF-8."""
+    
+    def test_switches_to_latin1_partway(self, tmp_path):
+        """Test that every line is yielded exactly once when decoding fails partway."""
+        # Enough valid lines that some are yielded before the invalid byte is decoded
+        utf8_lines = [f"line {i} ok ü" for i in range(5000)]
+        tail_lines = ["bad byte \xff here", "after the bad byte"]
+        log_file = tmp_path / "mixed.log"
+        log_file.write_bytes(
+            ("\n".join(utf8_lines) + "\n\n").encode("utf-8")
+            + ("\n".join(tail_lines) + "\n").encode("latin1")
+        )
+        provider = LogHubProvider("SSH", data_dir=str(tmp_path / "data"), cache_dir=str(tmp_path / "cache"))
+        
+        lines = list(provider._iter_log_file(log_file))
+        
+        # Lines yielded before the switch stay UTF-8; the rest are read again as latin1
+        utf8_count = next(
+            (i for i, (line, expected) in enumerate(zip(lines, utf8_lines)) if line != expected),
+            len(utf8_lines)
+        )
+        latin1_lines = [line.encode("utf-8").decode("latin1") for line in utf8_lines]
+        assert 0 < utf8_count
+        assert lines == utf8_lines[:utf8_count] + latin1_lines[utf8_count:] + tail_lines
+
+
+class TestSampleLoading:
+    """Test limited and full loads and the on-disk samples cache."""
+    
+    def test_limit_reads_prefix_of_full_load(self, make_provider):
+        """Test that a limited load returns the first entries of a full load."""
+        provider = make_provider("SSH", {"SSH/SSH.log": SSH_LOG})
+        
+        limited = provider.load_samples(limit=2)
+        full = provider.load_samples()
+        
+        assert limited == full[:2]
+        assert len(full) == len(SSH_LINES)
+    
+    def test_limited_load_not_cached(self, make_provider):
+        """Test that only full loads write the samples cache."""
+        provider = make_provider("SSH", {"SSH/SSH.log": SSH_LOG})
+        
+        provider.load_samples(limit=2)
+        
+        assert provider._samples_cache is None
+        assert not provider._get_samples_cache_path().exists()
+    
+    def test_samples_cache_round_trip(self, make_provider, monkeypatch):
+        """Test that a new provider reads a full load back from the cache."""
+        provider = make_provider("SSH", {"SSH/SSH.log": SSH_LOG})
+        full = provider.load_samples()
+        assert provider._get_samples_cache_path().exists()
+        
+        def fail_processing(self, extract_dir):
+            raise AssertionError("log parsed again despite a valid cache")
+        
+        monkeypatch.setattr(LogHubProvider, "_process_dataset_specific", fail_processing)
+        reloaded = LogHubProvider("SSH", data_dir=str(provider.data_dir), cache_dir=str(provider.cache_dir))
+        
+        assert reloaded.load_samples() == full
+    
+    def test_samples_cache_ignored_after_log_changes(self, make_provider):
+        """Test that the cache is not served once the extracted log is replaced."""
+        provider = make_provider("SSH", {"SSH/SSH.log": SSH_LOG})
+        provider.load_samples()
+        
+        log_file = provider._get_extract_dir() / "SSH.log"
+        log_file.write_bytes(SSH_LOG + b"Dec 10 07:02:47 LabSZ sshd[24203]: Connection closed\n")
+        reloaded = LogHubProvider("SSH", data_dir=str(provider.data_dir), cache_dir=str(provider.cache_dir))
+        
+        assert len(reloaded.load_samples()) == len(SSH_LINES) + 1
+    
+    def test_corrupt_samples_cache_ignored(self, make_provider):
+        """Test that a cache file that is not a samples cache is ignored."""
+        provider = make_provider("SSH", {"SSH/SSH.log": SSH_LOG})
+        provider.load_samples()
+        provider._get_samples_cache_path().write_bytes(b"\x80\x04]\x94.")
+        
+        reloaded = LogHubProvider("SSH", data_dir=str(provider.data_dir), cache_dir=str(provider.cache_dir))
+        
+        assert [sample.content for sample in reloaded.load_samples()] == SSH_LINES
+
+
+class FakeRangeResponse:
+    """Minimal streamed response to an HTTP Range request."""
+    
+    def __init__(self, body: bytes, status_code: int = 206):
+        self.body = body
+        self.status_code = status_code
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+    
+    def iter_content(self, chunk_size):
+        yield self.body
+
+
+class TestRangeDownload:
+    """Test archives downloaded as parallel HTTP Range requests."""
+    
+    ARCHIVE = bytes(range(256)) * 4
+    
+    @pytest.fixture
+    def provider(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(loghub_provider, "_RANGE_SEGMENT_SIZE", 100)
+        return LogHubProvider("SSH", data_dir=str(tmp_path / "data"), cache_dir=str(tmp_path / "cache"))
+    
+    def serve_ranges(self, monkeypatch, failing_start=None):
+        """Serve ARCHIVE by byte range, failing the segment that starts at failing_start."""
+        def fake_get(url, headers=None, stream=False):
+            start, end = (int(bound) for bound in headers["Range"][len("bytes="):].split("-"))
+            if start == failing_start:
+                return FakeRangeResponse(b"", status_code=503)
+            return FakeRangeResponse(self.ARCHIVE[start:end + 1])
+        
+        monkeypatch.setattr(loghub_provider.requests, "get", fake_get)
+    
+    def test_segments_assembled(self, provider, monkeypatch):
+        """Test that all segments end up at their offsets in the archive."""
+        self.serve_ranges(monkeypatch)
+        file_path = provider.data_dir / "SSH.tar.gz"
+        
+        assert provider._download_ranges("https://example.org/SSH.tar.gz", file_path, len(self.ARCHIVE))
+        
+        assert file_path.read_bytes() == self.ARCHIVE
+        assert not file_path.with_name("SSH.tar.gz.part").exists()
+    
+    def test_failed_segment_removes_part_file(self, provider, monkeypatch):
+        """Test that a segment error leaves neither the archive nor a part file."""
+        self.serve_ranges(monkeypatch, failing_start=500)
+        file_path = provider.data_dir / "SSH.tar.gz"
+        
+        with pytest.raises(requests.HTTPError):
+            provider._download_ranges("https://example.org/SSH.tar.gz", file_path, len(self.ARCHIVE))
+        
+        assert list(provider.data_dir.iterdir()) == []